@@ -9,11 +9,13 @@ codebase — not just the diff.
 from __future__ import annotations
 
 import fnmatch
+import functools
 import logging
 import os
 import re
 import subprocess
 import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any, Protocol, runtime_checkable
 
@@ -99,6 +101,15 @@ def _limit_result(text: str, max_chars: int = _MAX_RESULT_CHARS) -> str:
     )
 
 
+@functools.lru_cache(maxsize=8)
+def _ignore_dir_matcher(ignore_dirs: frozenset[str]) -> Callable[[str], re.Match[str] | None]:
+    """Compile *ignore_dirs* globs into one union regex, matched once per directory name."""
+    if not ignore_dirs:
+        return re.compile(r"(?!)").match
+    union = "|".join(fnmatch.translate(os.path.normcase(pat)) for pat in sorted(ignore_dirs))
+    return re.compile(union).match
+
+
 def walk_source_files(
     root: Path,
     extensions: frozenset[str] = _DEFAULT_EXTENSIONS,
@@ -131,12 +142,12 @@ def walk_source_files(
 
     # Fallback: manual walk
     paths = []
+    # The matcher cache needs a hashable key; callers may pass any set of names
+    ignored = _ignore_dir_matcher(frozenset(ignore_dirs))
     for dirpath, dirnames, filenames in os.walk(root):
         # Filter out ignored directories in-place
         dirnames[:] = [
-            d
-            for d in dirnames
-            if d not in ignore_dirs and not any(fnmatch.fnmatch(d, pat) for pat in ignore_dirs)
+            d for d in dirnames if d not in ignore_dirs and not ignored(os.path.normcase(d))
         ]
         for fname in filenames:
             fpath = Path(dirpath) / fname
@@ -20,6 +20,9 @@ from grippy.schema import Finding
 
 # --- Diff parser ---
 
+_FILE_HEADER_RE = re.compile(r"^diff --git a/.+ b/(.+)$")
+_HUNK_HEADER_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+
 
 def parse_diff_lines(diff_text: str) -> dict[str, set[int]]:
     """Parse unified diff to extract addressable RIGHT-side line numbers.
@@ -43,7 +46,7 @@ def parse_diff_lines(diff_text: str) -> dict[str, set[int]]:
 
     for line in diff_text.splitlines():
         # Track current file from diff headers
-        file_match = re.match(r"^diff --git a/.+ b/(.+)$", line)
+        file_match = _FILE_HEADER_RE.match(line)
         if file_match:
             current_file = file_match.group(1)
             if current_file not in result:
@@ -51,7 +54,7 @@ def parse_diff_lines(diff_text: str) -> dict[str, set[int]]:
             continue
 
         # Parse hunk header for right-side starting line
-        hunk_match = re.match(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@", line)
+        hunk_match = _HUNK_HEADER_RE.match(line)
         if hunk_match:
             right_line = int(hunk_match.group(1))
             continue
@@ -130,6 +133,8 @@ _DANGEROUS_SCHEME_RE = re.compile(
     r"(?:javascript|data|vbscript)\s*:",
     re.IGNORECASE,
 )
+_MARKDOWN_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]+\)")
+_EXTERNAL_LINK_RE = re.compile(r"\[([^\]]*)\]\(https?://[^)]+\)")
 
 
 def _sanitize_comment_text(text: str) -> str:
@@ -147,8 +152,8 @@ def _sanitize_comment_text(text: str) -> str:
     text = navi_sanitize.clean(text)
     text = nh3.clean(text, tags=set())
     # Strip markdown images (tracking pixels) and external links (phishing)
-    text = re.sub(r"!\[[^\]]*\]\([^)]+\)", "", text)
-    text = re.sub(r"\[([^\]]*)\]\(https?://[^)]+\)", r"\1", text)
+    text = _MARKDOWN_IMAGE_RE.sub("", text)
+    text = _EXTERNAL_LINK_RE.sub(r"\1", text)
     text = _DANGEROUS_SCHEME_RE.sub("", unquote(text))
     return text
 
@@ -164,17 +169,20 @@ _SEVERITY_EMOJI = {
 
 # Marker format: <!-- grippy:file:category:line -->
 _GRIPPY_MARKER_RE = re.compile(r"<!-- grippy:(?P<file>[^:]+):(?P<category>[^:]+):(?P<line>\d+) -->")
+_UNSAFE_PATH_CHARS_RE = re.compile(r"[^a-zA-Z0-9_./ -]")
 
 
 def _sanitize_path(path: str) -> str:
     """Sanitize file paths — Unicode normalization + traversal removal + allowlist."""
     path = navi_sanitize.clean(path, escaper=navi_sanitize.path_escaper)
-    return re.sub(r"[^a-zA-Z0-9_./ -]", "", path)
+    return _UNSAFE_PATH_CHARS_RE.sub("", path)
 
 
-def _finding_marker(finding: Finding) -> str:
-    """Build an HTML comment marker for dedup — keyed on file, category, line."""
-    safe_file = _sanitize_path(finding.file)
+def _finding_marker(finding: Finding, safe_file: str) -> str:
+    """Build an HTML comment marker for dedup — keyed on file, category, line.
+
+    *safe_file* is ``_sanitize_path(finding.file)``, computed once by the caller.
+    """
     return f"<!-- grippy:{safe_file}:{finding.category.value}:{finding.line_start} -->"
 
 
@@ -192,6 +200,7 @@ def build_review_comment(finding: Finding) -> dict[str, str | int]:
     description = _sanitize_comment_text(finding.description)
     suggestion = _sanitize_comment_text(finding.suggestion)
     grippy_note = _sanitize_comment_text(finding.grippy_note)
+    safe_file = _sanitize_path(finding.file)
     body_lines = [
         f"#### {emoji} {finding.severity.value}: {title}",
         f"Confidence: {finding.confidence}%",
@@ -202,10 +211,10 @@ def build_review_comment(finding: Finding) -> dict[str, str | int]:
         "",
         f"*\u2014 {grippy_note}*",
         "",
-        _finding_marker(finding),
+        _finding_marker(finding, safe_file),
     ]
     return {
-        "path": _sanitize_path(finding.file),
+        "path": safe_file,
         "body": "\n".join(body_lines),
         "line": finding.line_start,
         "side": "RIGHT",
@@ -378,14 +387,16 @@ def post_review(
     existing = fetch_grippy_comments(pr)
 
     # 2. Classify: which current findings already have comments?
+    # (each finding's key is built once and shared with step 3)
     new_findings: list[Finding] = []
+    current_keys: set[tuple[str, str, int]] = set()
     for finding in findings:
         key = (finding.file, finding.category.value, finding.line_start)
+        current_keys.add(key)
         if key not in existing:
             new_findings.append(finding)
 
     # 3. Identify resolved: existing comments not in current findings
-    current_keys = {(f.file, f.category.value, f.line_start) for f in findings}
     resolved_comments = [comment for key, comment in existing.items() if key not in current_keys]
 
     # Detect fork PR — GITHUB_TOKEN is read-only for forks
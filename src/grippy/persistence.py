@@ -59,10 +59,10 @@ def _record_id(node_type: NodeType | str, *parts: str) -> str:
     included in the hash input so different types with the same parts
     produce different digests.
     """
-    type_str = node_type.value if isinstance(node_type, NodeType) else node_type
-    raw = ":".join([type_str, *parts])
+    # NodeType is a StrEnum, so the member already is its value string.
+    raw = ":".join([node_type, *parts])
     digest = hashlib.sha256(raw.encode()).hexdigest()[:12]
-    return f"{type_str.upper()}:{digest}"
+    return f"{node_type.upper()}:{digest}"
 
 
 # --- SQLite schema ---
@@ -162,7 +162,7 @@ class GrippyStore:
         cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='edges'")
         if cur.fetchone() is not None:
             cur.execute("PRAGMA table_info(edges)")
-            columns = {row[1] for row in cur.fetchall()}
+            columns = {row[1] for row in cur}
             if "source_id" in columns:
                 # v1 edges — always drop
                 cur.execute("DROP TABLE IF EXISTS edges")
@@ -171,7 +171,7 @@ class GrippyStore:
                 cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='nodes'")
                 if cur.fetchone() is not None:
                     cur.execute("PRAGMA table_info(nodes)")
-                    node_columns = {row[1] for row in cur.fetchall()}
+                    node_columns = {row[1] for row in cur}
                     if "session_id" not in node_columns:
                         cur.execute("DROP TABLE IF EXISTS nodes")
 
@@ -179,7 +179,7 @@ class GrippyStore:
     def _add_updated_at_column(cur: sqlite3.Cursor) -> None:
         """Add updated_at column if missing (backfill from created_at)."""
         cur.execute("PRAGMA table_info(nodes)")
-        columns = {row[1] for row in cur.fetchall()}
+        columns = {row[1] for row in cur}
         if "updated_at" not in columns:
             cur.execute("ALTER TABLE nodes ADD COLUMN updated_at TEXT")
             cur.execute("UPDATE nodes SET updated_at = created_at WHERE updated_at IS NULL")
@@ -215,19 +215,19 @@ class GrippyStore:
         cur = self._conn.cursor()
         cur.execute("BEGIN")
         try:
-            for node in nodes:
-                cur.execute(
-                    """INSERT INTO nodes
-                    (id, type, label, data, session_id, status, fingerprint, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(id) DO UPDATE SET
-                        label = excluded.label,
-                        data = excluded.data,
-                        session_id = excluded.session_id,
-                        status = excluded.status,
-                        fingerprint = excluded.fingerprint,
-                        created_at = nodes.created_at,
-                        updated_at = excluded.updated_at""",
+            cur.executemany(
+                """INSERT INTO nodes
+                (id, type, label, data, session_id, status, fingerprint, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    label = excluded.label,
+                    data = excluded.data,
+                    session_id = excluded.session_id,
+                    status = excluded.status,
+                    fingerprint = excluded.fingerprint,
+                    created_at = nodes.created_at,
+                    updated_at = excluded.updated_at""",
+                (
                     (
                         node["id"],
                         node["type"],
@@ -238,16 +238,21 @@ class GrippyStore:
                         node["fingerprint"],
                         node["created_at"],
                         node["updated_at"],
-                    ),
-                )
-            for source, target, relationship, properties in edges:
-                cur.execute(
-                    """INSERT INTO edges (source, target, relationship, properties, created_at)
-                    VALUES (?, ?, ?, ?, datetime('now'))
-                    ON CONFLICT(source, relationship, target) DO UPDATE SET
-                        properties = excluded.properties""",
-                    (source, target, relationship, properties),
-                )
+                    )
+                    for node in nodes
+                ),
+            )
+            # Unpacking in the generator keeps malformed edges a ValueError
+            cur.executemany(
+                """INSERT INTO edges (source, target, relationship, properties, created_at)
+                VALUES (?, ?, ?, ?, datetime('now'))
+                ON CONFLICT(source, relationship, target) DO UPDATE SET
+                    properties = excluded.properties""",
+                (
+                    (source, target, relationship, properties)
+                    for source, target, relationship, properties in edges
+                ),
+            )
             self._conn.commit()
         except Exception:
             self._conn.rollback()
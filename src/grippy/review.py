@@ -15,30 +15,48 @@ Environment variables:
     GRIPPY_API_KEY          — API key for non-OpenAI endpoints (embedding auth fallback)
     GRIPPY_DATA_DIR         — persistent directory for graph DB + LanceDB
     GRIPPY_TIMEOUT          — seconds before review is killed (0 = no timeout)
+    GRIPPY_REVIEW_CACHE     — "1" to reuse cached reviews for identical diffs
     GITHUB_REPOSITORY       — owner/repo (set by GitHub Actions, fallback)
 """
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import importlib.metadata
 import json
+import math
 import os
 import sys
-from collections import Counter
+import tempfile
+import time
 from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
 import navi_sanitize
 
-from grippy.agent import create_reviewer, format_pr_context
+from grippy.agent import DEFAULT_PROMPTS_DIR, create_reviewer, format_pr_context
 from grippy.embedder import create_embedder
 from grippy.github_review import post_review
 from grippy.retry import ReviewParseError, run_review
-from grippy.rules import RuleResult, RuleSeverity, check_gate, load_profile, run_rules
+from grippy.rules import (
+    ChangedFile,
+    RuleResult,
+    RuleSeverity,
+    check_gate,
+    load_profile,
+    parse_diff,
+    run_rules,
+)
+from grippy.schema import GrippyReview
 
 # Max diff size sent to the LLM — ~500K chars ≈ 125K tokens
 MAX_DIFF_CHARS = 500_000
 
+# Cached reviews older than this are ignored (and overwritten on the next run)
+REVIEW_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
 
 _ERROR_HINTS: dict[str, str] = {
     "CONFIG ERROR": "Valid `GRIPPY_TRANSPORT` values: `openai`, `local`.",
@@ -73,7 +91,7 @@ def load_pr_event(event_path: Path) -> dict[str, Any]:
         FileNotFoundError: If event_path doesn't exist.
         KeyError: If event JSON lacks pull_request key.
     """
-    data = json.loads(event_path.read_text(encoding="utf-8"))
+    data = json.loads(event_path.read_bytes())
     pr = data["pull_request"]
     return {
         "pr_number": pr["number"],
@@ -145,26 +163,97 @@ def post_comment(token: str, repo: str, pr_number: int, body: str) -> None:
     pr.create_issue_comment(body)
 
 
-def _with_timeout(fn: Callable[[], Any], *, timeout_seconds: int) -> Any:
-    """Run *fn* with a SIGALRM timeout (Linux only).  0 = no timeout."""
+def _with_timeout(fn: Callable[[], Any], *, timeout_seconds: float) -> Any:
+    """Run *fn* with a SIGALRM interval-timer timeout.  0 = no timeout.
+
+    Uses ``setitimer(ITIMER_REAL)`` so fractional seconds are honoured. Where
+    SIGALRM is unavailable (Windows) or off the main thread, *fn* runs unguarded.
+    """
     if timeout_seconds <= 0:
         return fn()
 
     import signal
+    import threading
+
+    if not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        print("::warning::Review timeout unsupported here — running without a timeout")
+        return fn()
 
     def _handler(signum: int, frame: Any) -> None:
-        msg = f"Review timed out after {timeout_seconds}s"
+        msg = f"Review timed out after {timeout_seconds:g}s"
         raise TimeoutError(msg)
 
     old_handler = signal.signal(signal.SIGALRM, _handler)
-    signal.alarm(timeout_seconds)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
     try:
         return fn()
     finally:
-        signal.alarm(0)
+        signal.setitimer(signal.ITIMER_REAL, 0)
         signal.signal(signal.SIGALRM, old_handler)
 
 
+@functools.cache
+def _review_cache_salt() -> str:
+    """Grippy version plus a digest of the shipped prompt set — upgrades bust the cache."""
+    try:
+        version = importlib.metadata.version("grippy-code-review")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    digest = hashlib.sha256()
+    for path in sorted(DEFAULT_PROMPTS_DIR.glob("*.md")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return f"{version}|{digest.hexdigest()}"
+
+
+def _review_cache_key(
+    *,
+    model_id: str,
+    base_url: str,
+    transport: str | None,
+    tools_enabled: bool,
+    profile: str,
+    mode: str,
+    user_message: str,
+) -> str:
+    """Hash everything that determines the LLM review into a cache key.
+
+    *user_message* is the exact prompt the model sees: PR metadata, the
+    (truncated) diff and the rule findings computed on the full diff. The
+    endpoint and tool availability are included because the same model id
+    can name different models on different servers, and tools change the review.
+    """
+    payload = (
+        f"{_review_cache_salt()}|{model_id}|{base_url}|{transport}|{tools_enabled}"
+        f"|{profile}|{mode}|{user_message}"
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _load_cached_review(cache_dir: Path, key: str) -> GrippyReview | None:
+    """Return the cached review for *key*, or None if missing, stale, or invalid."""
+    path = cache_dir / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime > REVIEW_CACHE_TTL_SECONDS:
+            return None
+        return GrippyReview.model_validate_json(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached_review(cache_dir: Path, key: str, review: GrippyReview) -> None:
+    """Atomically write *review* to the cache — readers never see a partial file."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(review.model_dump_json())
+        os.replace(tmp_name, cache_dir / f"{key}.json")
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 _SEVERITY_MAP: dict[RuleSeverity, str] = {
     RuleSeverity.CRITICAL: "CRITICAL",
     RuleSeverity.ERROR: "ERROR",
@@ -173,12 +262,14 @@ _SEVERITY_MAP: dict[RuleSeverity, str] = {
 }
 
 
+@functools.lru_cache(maxsize=1024)
 def _escape_rule_field(text: str) -> str:
     """Sanitize and escape rule finding fields to prevent prompt injection.
 
     Pipeline: navi-sanitize (invisible chars, bidi, homoglyphs, NFKC) →
     XML delimiter escaping. Crafted filenames or evidence strings could
     contain Unicode obfuscation or XML payloads — both are neutralized.
+    Cached: findings repeat the same file paths and fixed rule messages.
     """
     text = navi_sanitize.clean(text)
     return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
@@ -191,27 +282,39 @@ def _format_rule_findings(results: list[RuleResult]) -> str:
         sev = _SEVERITY_MAP.get(r.severity, "INFO")
         file_safe = _escape_rule_field(r.file)
         msg_safe = _escape_rule_field(r.message)
-        parts = [f"[{sev}] {r.rule_id} @ {file_safe}"]
-        if r.line is not None:
-            parts[0] += f":{r.line}"
-        parts[0] += f": {msg_safe}"
+        loc = file_safe if r.line is None else f"{file_safe}:{r.line}"
+        line = f"[{sev}] {r.rule_id} @ {loc}: {msg_safe}"
         if r.evidence:
-            parts.append(f"  evidence: {_escape_rule_field(r.evidence)}")
-        lines.append(" | ".join(parts) if r.evidence else parts[0])
+            line = f"{line} |   evidence: {_escape_rule_field(r.evidence)}"
+        lines.append(line)
     return "\n".join(lines)
 
 
+@functools.lru_cache(maxsize=4)
+def _load_dev_vars(path: str, mtime_ns: int, size: int) -> tuple[tuple[str, str], ...]:
+    """Parse KEY=VALUE lines from a .dev.vars file.
+
+    Cached on (path, mtime, size) so repeated entries into main() skip the
+    re-parse until the file actually changes.
+    """
+    pairs: list[tuple[str, str]] = []
+    for line in Path(path).read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            key, _, value = line.partition("=")
+            pairs.append((key.strip(), value.strip()))
+    return tuple(pairs)
+
+
 def main(*, profile: str | None = None) -> None:
     """CI entry point — reads env, runs review, posts comment."""
     # Load .dev.vars if present (local dev only — never in CI)
     if not os.environ.get("CI"):
         dev_vars_path = Path(__file__).resolve().parent.parent.parent / ".dev.vars"
         if dev_vars_path.is_file():
-            for line in dev_vars_path.read_text().splitlines():
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, _, value = line.partition("=")
-                    os.environ.setdefault(key.strip(), value.strip())
+            st = dev_vars_path.stat()
+            for key, value in _load_dev_vars(str(dev_vars_path), st.st_mtime_ns, st.st_size):
+                os.environ.setdefault(key, value)
 
     # Required env
     token = os.environ.get("GITHUB_TOKEN", "")
@@ -221,7 +324,7 @@ def main(*, profile: str | None = None) -> None:
     api_key = os.environ.get("GRIPPY_API_KEY", "lm-studio")
     transport = os.environ.get("GRIPPY_TRANSPORT") or None
     mode = os.environ.get("GRIPPY_MODE", "pr_review")
-    timeout_seconds = int(os.environ.get("GRIPPY_TIMEOUT", "300"))
+    timeout_str = os.environ.get("GRIPPY_TIMEOUT", "300")
 
     if not token:
         print("::error::GITHUB_TOKEN not set")
@@ -229,6 +332,14 @@ def main(*, profile: str | None = None) -> None:
     if not event_path_str:
         print("::error::GITHUB_EVENT_PATH not set")
         sys.exit(1)
+    try:
+        timeout_seconds = float(timeout_str)
+    except ValueError:
+        timeout_seconds = math.nan
+    # inf/nan parse as floats but make setitimer raise — only finite, non-negative values
+    if not (math.isfinite(timeout_seconds) and timeout_seconds >= 0):
+        print(f"::error::GRIPPY_TIMEOUT must be a non-negative number of seconds: {timeout_str!r}")
+        sys.exit(1)
 
     event_path = Path(event_path_str)
     if not event_path.is_file():
@@ -319,10 +430,8 @@ def main(*, profile: str | None = None) -> None:
         except Exception:
             pass  # nosec B110 — best-effort, don't mask the original error
         sys.exit(1)
-    file_count = diff.count("diff --git")
-    print(f"  {file_count} files, {len(diff)} chars")
 
-    # 3b. Run security rule engine on FULL diff (before truncation)
+    # 3b. Resolve profile — the diff is only parsed when the rule engine will run
     try:
         profile_config = load_profile(cli_profile=profile)
     except ValueError as exc:
@@ -335,23 +444,35 @@ def main(*, profile: str | None = None) -> None:
         )
         sys.exit(1)
 
+    changed_files: list[ChangedFile] | None = None
+    if profile_config.name != "general":
+        changed_files = parse_diff(diff)
+        file_count = len(changed_files)
+    else:
+        file_count = diff.count("diff --git")
+    print(f"  {file_count} files, {len(diff)} chars")
+
     rule_findings: list[RuleResult] = []
     rule_gate_failed = False
     expected_rule_counts: dict[str, int] | None = None
     expected_rule_files: dict[str, frozenset[str]] | None = None
     rule_findings_text = ""
 
-    if profile_config.name != "general":
+    # 3c. Run security rule engine on FULL diff (before truncation)
+    if changed_files is not None:
         print(f"Running rule engine (profile={profile_config.name})...")
-        rule_findings = run_rules(diff, profile_config)
+        rule_findings = run_rules(diff, profile_config, files=changed_files)
         rule_gate_failed = check_gate(rule_findings, profile_config)
         print(f"  {len(rule_findings)} findings, gate={'FAILED' if rule_gate_failed else 'passed'}")
         if rule_findings:
             rule_findings_text = _format_rule_findings(rule_findings)
-            expected_rule_counts = dict(Counter(r.rule_id for r in rule_findings))
+            expected_rule_counts = {}
+            rule_files: dict[str, set[str]] = {}
+            for r in rule_findings:
+                expected_rule_counts[r.rule_id] = expected_rule_counts.get(r.rule_id, 0) + 1
+                rule_files.setdefault(r.rule_id, set()).add(r.file)
             expected_rule_files = {
-                rule_id: frozenset(r.file for r in rule_findings if r.rule_id == rule_id)
-                for rule_id in expected_rule_counts
+                rule_id: frozenset(files) for rule_id, files in rule_files.items()
             }
         mode = "security_audit"
 
@@ -362,30 +483,6 @@ def main(*, profile: str | None = None) -> None:
     if diff_truncated:
         print(f"  Diff truncated to {MAX_DIFF_CHARS} chars ({file_count} files in original)")
 
-    # 3c. Create agent (after rule engine, so mode/rule_findings are resolved)
-    try:
-        agent = create_reviewer(
-            model_id=model_id,
-            base_url=base_url,
-            api_key=api_key,
-            transport=transport,
-            mode=mode,
-            db_path=data_dir / "grippy-session.db",
-            session_id=f"pr-{pr_event['pr_number']}",
-            tools=codebase_tools or None,
-            tool_call_limit=10 if codebase_tools else None,
-            include_rule_findings=bool(rule_findings),
-        )
-    except ValueError as exc:
-        print(f"::error::Invalid configuration: {exc}")
-        post_comment(
-            token,
-            pr_event["repo"],
-            pr_event["pr_number"],
-            _failure_comment(pr_event["repo"], "CONFIG ERROR"),
-        )
-        sys.exit(1)
-
     # 4. Format context
     user_message = format_pr_context(
         title=pr_event["title"],
@@ -396,18 +493,62 @@ def main(*, profile: str | None = None) -> None:
         rule_findings=rule_findings_text,
     )
 
+    # 4b. Exact-match review cache (opt-in) — CI retries and no-op rebases reuse the result
+    cache_dir = data_dir / "review-cache"
+    cache_key: str | None = None
+    cached_review: GrippyReview | None = None
+    if os.environ.get("GRIPPY_REVIEW_CACHE") == "1":
+        cache_key = _review_cache_key(
+            model_id=model_id,
+            base_url=base_url,
+            transport=transport,
+            tools_enabled=bool(codebase_tools),
+            profile=profile_config.name,
+            mode=mode,
+            user_message=user_message,
+        )
+        cached_review = _load_cached_review(cache_dir, cache_key)
+
+    # 4c. Create agent — only on a cache miss, so a hit never opens the session DB
+    if cached_review is None:
+        try:
+            agent = create_reviewer(
+                model_id=model_id,
+                base_url=base_url,
+                api_key=api_key,
+                transport=transport,
+                mode=mode,
+                db_path=data_dir / "grippy-session.db",
+                session_id=f"pr-{pr_event['pr_number']}",
+                tools=codebase_tools or None,
+                tool_call_limit=10 if codebase_tools else None,
+                include_rule_findings=bool(rule_findings),
+            )
+        except ValueError as exc:
+            print(f"::error::Invalid configuration: {exc}")
+            post_comment(
+                token,
+                pr_event["repo"],
+                pr_event["pr_number"],
+                _failure_comment(pr_event["repo"], "CONFIG ERROR"),
+            )
+            sys.exit(1)
+
     # 5. Run review with retry + validation (replaces agent.run + parse_review_response)
-    print("Running review...")
+    print("Running review..." if cached_review is None else "Using cached review...")
     try:
-        review = _with_timeout(
-            lambda: run_review(
-                agent,
-                user_message,
-                expected_rule_counts=expected_rule_counts,
-                expected_rule_files=expected_rule_files,
-            ),
-            timeout_seconds=timeout_seconds,
-        )
+        if cached_review is not None:
+            review = cached_review
+        else:
+            review = _with_timeout(
+                lambda: run_review(
+                    agent,
+                    user_message,
+                    expected_rule_counts=expected_rule_counts,
+                    expected_rule_files=expected_rule_files,
+                ),
+                timeout_seconds=timeout_seconds,
+            )
     except ReviewParseError as exc:
         print(f"::error::Grippy review failed after {exc.attempts} attempts: {exc}")
         try:
@@ -448,6 +589,12 @@ def main(*, profile: str | None = None) -> None:
     # Override self-reported model — LLMs hallucinate their own model name
     review.model = model_id
 
+    if cache_key is not None and cached_review is None:
+        try:
+            _store_cached_review(cache_dir, cache_key, review)
+        except OSError as exc:
+            print(f"::warning::Failed to write review cache (non-fatal): {exc}")
+
     print(f"  Score: {review.score.overall}/100 — {review.verdict.status.value}")
     print(f"  Findings: {len(review.findings)}")
 
@@ -482,14 +629,17 @@ def main(*, profile: str | None = None) -> None:
     # 7. Set outputs for GitHub Actions
     github_output = os.environ.get("GITHUB_OUTPUT", "")
     if github_output:
+        payload = (
+            f"score={review.score.overall}\n"
+            f"verdict={review.verdict.status.value}\n"
+            f"findings-count={len(review.findings)}\n"
+            f"merge-blocking={str(review.verdict.merge_blocking).lower()}\n"
+            f"rule-findings-count={len(rule_findings)}\n"
+            f"rule-gate-failed={str(rule_gate_failed).lower()}\n"
+            f"profile={profile_config.name}\n"
+        )
         with open(github_output, "a") as f:
-            f.write(f"score={review.score.overall}\n")
-            f.write(f"verdict={review.verdict.status.value}\n")
-            f.write(f"findings-count={len(review.findings)}\n")
-            f.write(f"merge-blocking={str(review.verdict.merge_blocking).lower()}\n")
-            f.write(f"rule-findings-count={len(rule_findings)}\n")
-            f.write(f"rule-gate-failed={str(rule_gate_failed).lower()}\n")
-            f.write(f"profile={profile_config.name}\n")
+            f.write(payload)
 
     # Exit non-zero if merge-blocking or rule gate failed
     if rule_gate_failed:
@@ -21,9 +21,12 @@ __all__ = [
 ]
 
 
-def run_rules(diff: str, profile: ProfileConfig) -> list[RuleResult]:
-    """Convenience: parse diff, run all rules, return results."""
-    files = parse_diff(diff)
+def run_rules(
+    diff: str, profile: ProfileConfig, files: list[ChangedFile] | None = None
+) -> list[RuleResult]:
+    """Convenience: parse diff (unless *files* is already parsed), run all rules."""
+    if files is None:
+        files = parse_diff(diff)
     ctx = RuleContext(diff=diff, files=files, config=profile)
     engine = RuleEngine()
     return engine.run(ctx)
@@ -20,7 +20,7 @@ class RuleSeverity(IntEnum):
     CRITICAL = 3
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RuleResult:
     """A single finding produced by a deterministic rule."""
 
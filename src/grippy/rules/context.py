@@ -4,15 +4,16 @@
 from __future__ import annotations
 
 import fnmatch
+import functools
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from grippy.rules.config import ProfileConfig
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiffLine:
     """A single line within a diff hunk."""
 
@@ -22,7 +23,7 @@ class DiffLine:
     new_lineno: int | None  # Right-side line number
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiffHunk:
     """A contiguous hunk from a unified diff."""
 
@@ -33,7 +34,7 @@ class DiffHunk:
     lines: list[DiffLine]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChangedFile:
     """A file that was changed in the diff."""
 
@@ -43,6 +44,26 @@ class ChangedFile:
     is_deleted: bool = False
     is_renamed: bool = False
     rename_from: str | None = None
+    ext: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Computed once per file — every rule filters on it
+        object.__setattr__(self, "ext", _file_ext(self.path))
+
+
+def _file_ext(path: str) -> str:
+    """Get file extension including the dot."""
+    _, dot, ext = path.rpartition(".")
+    return dot + ext if dot else ""
+
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_glob(path_glob: str) -> re.Pattern[str]:
+    """Translate and compile a glob once — rules reuse the same few globs."""
+    return re.compile(fnmatch.translate(path_glob))
 
 
 @dataclass
@@ -52,31 +73,84 @@ class RuleContext:
     diff: str
     files: list[ChangedFile]
     config: ProfileConfig
+    files_by_ext: dict[str, list[ChangedFile]] = field(init=False, repr=False, compare=False)
+    _added_by_path: dict[str, list[tuple[int, str]]] = field(init=False, repr=False, compare=False)
+    _added_text: dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # One sweep over the diff — rules query extensions and added lines many times
+        self.files_by_ext = {}
+        self._added_by_path = {}
+        self._added_text = {}
+        for f in self.files:
+            self.files_by_ext.setdefault(f.ext, []).append(f)
+            added = self._added_by_path.setdefault(f.path, [])
+            for hunk in f.hunks:
+                for line in hunk.lines:
+                    if line.type == "add" and line.new_lineno is not None:
+                        added.append((line.new_lineno, line.content))
 
     @property
     def files_changed(self) -> list[str]:
         """Return list of changed file paths."""
         return [f.path for f in self.files]
 
+    def files_with_ext(self, exts: frozenset[str]) -> list[ChangedFile]:
+        """Return changed files whose extension is in *exts*, in diff order."""
+        buckets = [self.files_by_ext[ext] for ext in exts if ext in self.files_by_ext]
+        if len(buckets) <= 1:
+            return buckets[0] if buckets else []
+        return [f for f in self.files if f.ext in exts]
+
+    def added_lines_in(self, path: str) -> list[tuple[int, str]]:
+        """Return (lineno, content) for added lines in exactly *path*.
+
+        The list is the shared per-file index built at construction — every
+        rule reads the same enumeration, so callers must not mutate it.
+        """
+        return self._added_by_path.get(path, [])
+
+    def added_text_in(self, path: str) -> str:
+        """Return the added lines of *path* joined by newlines (built once, on demand).
+
+        Any per-line match of a pattern without ``^``/``$`` anchors is also a
+        match in this text, so one search here can rule out a whole file before
+        rules fall back to their line-by-line logic.
+        """
+        text = self._added_text.get(path)
+        if text is None:
+            text = "\n".join(c for _, c in self.added_lines_in(path))
+            self._added_text[path] = text
+        return text
+
     def added_lines_for(self, path_glob: str) -> list[tuple[str, int, str]]:
         """Return (file, lineno, content) for added lines in matching files."""
-        results: list[tuple[str, int, str]] = []
-        for f in self.files:
-            if not fnmatch.fnmatch(f.path, path_glob):
-                continue
-            for hunk in f.hunks:
-                for line in hunk.lines:
-                    if line.type == "add" and line.new_lineno is not None:
-                        results.append((f.path, line.new_lineno, line.content))
-        return results
+        if _GLOB_CHARS.isdisjoint(path_glob):
+            return [(path_glob, ln, c) for ln, c in self._added_by_path.get(path_glob, ())]
+        match = _compile_glob(path_glob).match
+        return [
+            (path, ln, c)
+            for path, added in self._added_by_path.items()
+            if match(path)
+            for ln, c in added
+        ]
 
 
 # --- Diff parser ---
 
 _FILE_HEADER_RE = re.compile(r"^diff --git a/.+ b/(.+)$")
 _HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
-_RENAME_FROM_RE = re.compile(r"^rename from (.+)$")
-_RENAME_TO_RE = re.compile(r"^rename to (.+)$")
+
+# Metadata lines between a file header and its first hunk. The skip prefixes carry
+# nothing the rules need (rename targets come from the header) and are rejected with
+# one startswith() call; the few flag-setting prefixes are then checked in order.
+_SKIP_PREFIXES = ("index ", "---", "+++", "Binary files", "rename to ")
+_META_PREFIXES: tuple[tuple[str, str], ...] = (
+    ("new file", "new"),
+    ("deleted file", "deleted"),
+    ("similarity index", "renamed"),
+    ("rename from ", "rename_from"),
+)
 
 
 def parse_diff(diff_text: str) -> list[ChangedFile]:
@@ -105,6 +179,8 @@ def parse_diff(diff_text: str) -> list[ChangedFile]:
     new_line = 0
     in_hunk = False
 
+    # The flush helpers hand their accumulator lists to the frozen dataclasses and
+    # rebind fresh ones, so no copy is needed — nothing appends to a flushed list.
     def _flush_hunk() -> None:
         nonlocal in_hunk, hunk_lines
         if in_hunk and hunk_lines:
@@ -114,7 +190,7 @@ def parse_diff(diff_text: str) -> list[ChangedFile]:
                     old_count=hunk_old_count,
                     new_start=hunk_new_start,
                     new_count=hunk_new_count,
-                    lines=list(hunk_lines),
+                    lines=hunk_lines,
                 )
             )
         hunk_lines = []
@@ -127,7 +203,7 @@ def parse_diff(diff_text: str) -> list[ChangedFile]:
             files.append(
                 ChangedFile(
                     path=current_path,
-                    hunks=list(current_hunks),
+                    hunks=current_hunks,
                     is_new=is_new,
                     is_deleted=is_deleted,
                     is_renamed=is_renamed,
@@ -141,107 +217,68 @@ def parse_diff(diff_text: str) -> list[ChangedFile]:
         is_renamed = False
         rename_from = None
 
-    lines = diff_text.splitlines()
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        # File header
-        file_match = _FILE_HEADER_RE.match(line)
-        if file_match:
-            _flush_file()
-            current_path = file_match.group(1)
-            i += 1
-            continue
+    for line in diff_text.splitlines():
+        first = line[:1]
 
-        # Metadata lines between file header and first hunk
-        if not in_hunk and current_path is not None:
-            if line.startswith("new file"):
-                is_new = True
-                i += 1
-                continue
-            if line.startswith("deleted file"):
-                is_deleted = True
-                i += 1
-                continue
-            if line.startswith("similarity index"):
-                is_renamed = True
-                i += 1
+        if in_hunk:
+            # Hunk body lines dominate a diff, so they are classified first and on
+            # their first character alone; none of these can start a header line.
+            # DiffLine is built positionally (type, content, old_lineno, new_lineno):
+            # keyword binding costs about a third of the frozen __init__ call.
+            if first == "+":
+                hunk_lines.append(DiffLine("add", line[1:], None, new_line))
+                new_line += 1
                 continue
-            rename_from_match = _RENAME_FROM_RE.match(line)
-            if rename_from_match:
-                rename_from = rename_from_match.group(1)
-                is_renamed = True
-                i += 1
+            if first == "-":
+                hunk_lines.append(DiffLine("remove", line[1:], old_line, None))
+                old_line += 1
                 continue
-            if _RENAME_TO_RE.match(line):
-                i += 1
+            if first == " ":
+                hunk_lines.append(DiffLine("context", line[1:], old_line, new_line))
+                old_line += 1
+                new_line += 1
                 continue
-            if line.startswith("index ") or line.startswith("---") or line.startswith("+++"):
-                i += 1
+            if first == "\\":
+                # "\ No newline at end of file" — skip, don't increment
                 continue
-            if line.startswith("Binary files"):
-                i += 1
+            # Unexpected line ends the hunk and falls through to the header checks
+            _flush_hunk()
+
+        # File header
+        if first == "d":
+            file_match = _FILE_HEADER_RE.match(line)
+            if file_match:
+                _flush_file()
+                current_path = file_match.group(1)
                 continue
 
         # Hunk header
-        hunk_match = _HUNK_HEADER_RE.match(line)
-        if hunk_match:
-            _flush_hunk()
-            hunk_old_start = int(hunk_match.group(1))
-            hunk_old_count = int(hunk_match.group(2) or "1")
-            hunk_new_start = int(hunk_match.group(3))
-            hunk_new_count = int(hunk_match.group(4) or "1")
-            old_line = hunk_old_start
-            new_line = hunk_new_start
-            in_hunk = True
-            hunk_lines = []
-            i += 1
-            continue
-
-        if in_hunk:
-            if line.startswith("+"):
-                hunk_lines.append(
-                    DiffLine(
-                        type="add",
-                        content=line[1:],
-                        old_lineno=None,
-                        new_lineno=new_line,
-                    )
-                )
-                new_line += 1
-            elif line.startswith("-"):
-                hunk_lines.append(
-                    DiffLine(
-                        type="remove",
-                        content=line[1:],
-                        old_lineno=old_line,
-                        new_lineno=None,
-                    )
-                )
-                old_line += 1
-            elif line.startswith(" "):
-                hunk_lines.append(
-                    DiffLine(
-                        type="context",
-                        content=line[1:],
-                        old_lineno=old_line,
-                        new_lineno=new_line,
-                    )
-                )
-                old_line += 1
-                new_line += 1
-            elif line.startswith("\\"):
-                # "\ No newline at end of file" — skip, don't increment
-                pass
-            else:
-                # Unexpected line in hunk — might be a new file header without blank
-                # Re-process this line
+        if first == "@":
+            hunk_match = _HUNK_HEADER_RE.match(line)
+            if hunk_match:
                 _flush_hunk()
-                in_hunk = False
+                hunk_old_start = int(hunk_match.group(1))
+                hunk_old_count = int(hunk_match.group(2) or "1")
+                hunk_new_start = int(hunk_match.group(3))
+                hunk_new_count = int(hunk_match.group(4) or "1")
+                old_line = hunk_old_start
+                new_line = hunk_new_start
+                in_hunk = True
+                hunk_lines = []
                 continue
 
-        i += 1
+        # Metadata lines between file header and first hunk
+        if current_path is not None and not line.startswith(_SKIP_PREFIXES):
+            kind = next((k for prefix, k in _META_PREFIXES if line.startswith(prefix)), None)
+            if kind == "new":
+                is_new = True
+            elif kind == "deleted":
+                is_deleted = True
+            elif kind == "renamed":
+                is_renamed = True
+            elif kind == "rename_from" and len(line) > len("rename from "):
+                rename_from = line[len("rename from ") :]
+                is_renamed = True
 
     _flush_file()
     return files
@@ -32,14 +32,13 @@ _JS_SINKS: list[tuple[str, re.Pattern[str]]] = [
     ("spawnSync()", re.compile(r"\bspawnSync\s*\(")),
 ]
 
+# Union of each sink table — one search rejects clean lines before the ordered name lookup
+_PYTHON_SINK_UNION = re.compile("|".join(f"(?:{p.pattern})" for _, p in _PYTHON_SINKS))
+_JS_SINK_UNION = re.compile("|".join(f"(?:{p.pattern})" for _, p in _JS_SINKS))
+
 _PYTHON_EXTENSIONS = frozenset({".py"})
 _JS_EXTENSIONS = frozenset({".js", ".ts", ".jsx", ".tsx"})
-
-
-def _file_ext(path: str) -> str:
-    """Get file extension including the dot."""
-    dot = path.rfind(".")
-    return path[dot:] if dot >= 0 else ""
+_SCANNED_EXTENSIONS = _PYTHON_EXTENSIONS | _JS_EXTENSIONS
 
 
 class DangerousSinksRule:
@@ -51,32 +50,35 @@ class DangerousSinksRule:
 
     def run(self, ctx: RuleContext) -> list[RuleResult]:
         results: list[RuleResult] = []
-        for f in ctx.files:
-            ext = _file_ext(f.path)
+        # Unique paths: the added-line index already merges repeated entries of a path
+        paths = {f.path: f.ext for f in ctx.files_with_ext(_SCANNED_EXTENSIONS)}
+        for path, ext in paths.items():
             if ext in _PYTHON_EXTENSIONS:
-                results.extend(self._scan_python(f.path, ctx))
-            elif ext in _JS_EXTENSIONS:
-                results.extend(self._scan_js(f.path, ctx))
+                text = ctx.added_text_in(path)
+                if _PYTHON_SINK_UNION.search(text) or _YAML_LOAD_RE.search(text):
+                    results.extend(self._scan_python(path, ctx))
+            elif _JS_SINK_UNION.search(ctx.added_text_in(path)):
+                results.extend(self._scan_js(path, ctx))
         return results
 
     def _scan_python(self, path: str, ctx: RuleContext) -> list[RuleResult]:
         results: list[RuleResult] = []
-        added = [(ln, content) for _, ln, content in ctx.added_lines_for(path)]
-        for lineno, content in added:
+        for lineno, content in ctx.added_lines_in(path):
             # Standard sinks
-            for name, pattern in _PYTHON_SINKS:
-                if pattern.search(content):
-                    results.append(
-                        RuleResult(
-                            rule_id=self.id,
-                            severity=self.default_severity,
-                            message=f"Dangerous execution sink: {name}",
-                            file=path,
-                            line=lineno,
-                            evidence=content.strip(),
+            if _PYTHON_SINK_UNION.search(content):
+                for name, pattern in _PYTHON_SINKS:
+                    if pattern.search(content):
+                        results.append(
+                            RuleResult(
+                                rule_id=self.id,
+                                severity=self.default_severity,
+                                message=f"Dangerous execution sink: {name}",
+                                file=path,
+                                line=lineno,
+                                evidence=content.strip(),
+                            )
                         )
-                    )
-                    break  # one finding per line
+                        break  # one finding per line
 
             # yaml.load without safe loader
             if _YAML_LOAD_RE.search(content) and not _YAML_SAFE_RE.search(content):
@@ -95,8 +97,9 @@ class DangerousSinksRule:
 
     def _scan_js(self, path: str, ctx: RuleContext) -> list[RuleResult]:
         results: list[RuleResult] = []
-        added = [(ln, content) for _, ln, content in ctx.added_lines_for(path)]
-        for lineno, content in added:
+        for lineno, content in ctx.added_lines_in(path):
+            if not _JS_SINK_UNION.search(content):
+                continue
             for name, pattern in _JS_SINKS:
                 if pattern.search(content):
                     results.append(
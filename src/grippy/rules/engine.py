@@ -29,4 +29,5 @@ class RuleEngine:
 
     def check_gate(self, results: list[RuleResult], config: ProfileConfig) -> bool:
         """Return True if any result meets or exceeds the profile's fail_on threshold."""
-        return any(r.severity.value >= config.fail_on.value for r in results)
+        fail_on = config.fail_on
+        return any(r.severity >= fail_on for r in results)
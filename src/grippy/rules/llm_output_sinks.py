@@ -8,20 +8,20 @@ import re
 from grippy.rules.base import RuleResult, RuleSeverity
 from grippy.rules.context import DiffHunk, RuleContext
 
-# Central sanitizer registry — single source of truth
-SANITIZERS = frozenset(
-    {
-        "sanitize",
-        "escape",
-        "html.escape",
-        "markupsafe.escape",
-        "clean",
-        "sanitize_comment",
-        "_sanitize_comment_text",
-        "_escape_xml",
-        "bleach.clean",
-    }
+# Central sanitizer registry — single source of truth. Kept as an ordered tuple,
+# longest name first, so the alternation built from it is deterministic.
+_SANITIZER_LIST = (
+    "_sanitize_comment_text",
+    "markupsafe.escape",
+    "sanitize_comment",
+    "bleach.clean",
+    "html.escape",
+    "_escape_xml",
+    "sanitize",
+    "escape",
+    "clean",
 )
+SANITIZERS = frozenset(_SANITIZER_LIST)
 
 # LLM/model output tokens
 _MODEL_OUTPUT_RE = re.compile(
@@ -33,7 +33,7 @@ _SINK_RE = re.compile(
     r"\b(?:create_comment\(|create_issue_comment\(|\.body\s*=|post\(|render\(|f\"<)"
 )
 
-_SANITIZER_RE = re.compile("|".join(re.escape(s) for s in SANITIZERS))
+_SANITIZER_RE = re.compile("|".join(map(re.escape, _SANITIZER_LIST)))
 
 
 class LlmOutputSinksRule:
@@ -45,45 +45,46 @@ class LlmOutputSinksRule:
 
     def run(self, ctx: RuleContext) -> list[RuleResult]:
         results: list[RuleResult] = []
-        for f in ctx.files:
-            if not f.path.endswith(".py"):
+        for f in ctx.files_by_ext.get(".py", []):
+            # No model output anywhere in the file's additions — no chain can start
+            if not _MODEL_OUTPUT_RE.search(ctx.added_text_in(f.path)):
                 continue
             for hunk in f.hunks:
                 results.extend(self._scan_hunk(f.path, hunk))
         return results
 
     def _scan_hunk(self, path: str, hunk: DiffHunk) -> list[RuleResult]:
-        """Scan a single hunk for model output → sink without sanitizer."""
+        """Scan a single hunk for model output → sink without sanitizer.
+
+        Single forward sweep: each model-output line opens a chain that closes
+        at the first sink at or after it, and a sanitizer anywhere in that span
+        (the model line and sink line included) defuses every chain still open.
+        """
         results: list[RuleResult] = []
+        open_chains = 0  # unsanitized model-output lines still waiting for a sink
 
-        # Collect added lines in order
-        added_lines: list[tuple[int, str]] = []
         for line in hunk.lines:
-            if line.type == "add" and line.new_lineno is not None:
-                added_lines.append((line.new_lineno, line.content))
-
-        # Look for model output tokens, then scan forward for sinks
-        for i, (_lineno, content) in enumerate(added_lines):
-            if not _MODEL_OUTPUT_RE.search(content):
+            if line.type != "add" or line.new_lineno is None:
                 continue
-
-            # Scan forward in same hunk for sinks
-            for j in range(i, len(added_lines)):
-                sink_lineno, sink_content = added_lines[j]
-                if _SINK_RE.search(sink_content):
-                    # Check if any sanitizer appears between model output and sink
-                    between = " ".join(c for _, c in added_lines[i : j + 1])
-                    if not _SANITIZER_RE.search(between):
-                        results.append(
-                            RuleResult(
-                                rule_id=self.id,
-                                severity=self.default_severity,
-                                message="LLM output used in sink without sanitization",
-                                file=path,
-                                line=sink_lineno,
-                                evidence=sink_content.strip(),
-                            )
-                        )
-                        break  # One finding per model-output → sink chain
+            content = line.content
+            if _MODEL_OUTPUT_RE.search(content):
+                open_chains += 1
+            if not open_chains:
+                continue
+            if _SANITIZER_RE.search(content):
+                open_chains = 0
+                continue
+            if _SINK_RE.search(content):
+                # One finding per model-output → sink chain
+                finding = RuleResult(
+                    rule_id=self.id,
+                    severity=self.default_severity,
+                    message="LLM output used in sink without sanitization",
+                    file=path,
+                    line=line.new_lineno,
+                    evidence=content.strip(),
+                )
+                results.extend([finding] * open_chains)
+                open_chains = 0
 
         return results
@@ -24,6 +24,13 @@ TAINT_NAMES = frozenset(
     }
 )
 
+# A taint name as a whole alphabetic run — digits, underscores, and punctuation all delimit,
+# so ``user_id`` and ``request2`` match while ``username`` does not
+_TAINT_RE = re.compile(
+    r"(?<![a-zA-Z])(?:" + "|".join(sorted(map(re.escape, TAINT_NAMES))) + r")(?![a-zA-Z])",
+    re.IGNORECASE,
+)
+
 # File operation patterns
 _FILE_OPS_RE = re.compile(
     r"\b(?:open|Path|path\.join|os\.path\.join|read_file|write_file|send_file)\s*\("
@@ -40,19 +47,11 @@ _STRING_LITERAL_ONLY_RE = re.compile(
 _EXTENSIONS = frozenset({".py", ".js", ".ts"})
 
 
-def _file_ext(path: str) -> str:
-    dot = path.rfind(".")
-    return path[dot:] if dot >= 0 else ""
-
-
 def _has_taint_indicator(content: str) -> bool:
     """Check if any taint name appears as an identifier component in the arguments."""
     # Only check the arguments portion (after first open-paren)
     paren_idx = content.find("(")
-    check_portion = content[paren_idx:] if paren_idx >= 0 else content
-    # Split by non-alpha characters to get identifier parts
-    parts = set(re.split(r"[^a-zA-Z]+", check_portion.lower()))
-    return bool(TAINT_NAMES & parts)
+    return _TAINT_RE.search(content, max(paren_idx, 0)) is not None
 
 
 def _has_traversal_pattern(content: str) -> bool:
@@ -69,45 +68,46 @@ class PathTraversalRule:
 
     def run(self, ctx: RuleContext) -> list[RuleResult]:
         results: list[RuleResult] = []
-        for f in ctx.files:
-            ext = _file_ext(f.path)
-            if ext not in _EXTENSIONS:
+        # Unique paths: the added-line index already merges repeated entries of a path
+        for path in dict.fromkeys(f.path for f in ctx.files_with_ext(_EXTENSIONS)):
+            if not _FILE_OPS_RE.search(ctx.added_text_in(path)):
                 continue
-            for hunk in f.hunks:
-                for line in hunk.lines:
-                    if line.type != "add" or line.new_lineno is None:
-                        continue
-                    content = line.content
-
-                    # Skip pure string literal arguments
-                    if _STRING_LITERAL_ONLY_RE.search(content):
-                        continue
-
-                    # Check for file operation with taint indicator
-                    if _FILE_OPS_RE.search(content) and _has_taint_indicator(content):
-                        results.append(
-                            RuleResult(
-                                rule_id=self.id,
-                                severity=self.default_severity,
-                                message="File operation with user-controlled input indicator",
-                                file=f.path,
-                                line=line.new_lineno,
-                                evidence=content.strip(),
-                            )
+            for lineno, content in ctx.added_lines_in(path):
+                # Most lines have no file operation — one search gates everything else
+                file_op = _FILE_OPS_RE.search(content)
+                if file_op is None:
+                    continue
+
+                # Skip pure string literal arguments (a literal-only call is itself a
+                # file op, so it can't start before the first one)
+                if _STRING_LITERAL_ONLY_RE.search(content, file_op.start()):
+                    continue
+
+                # Check for file operation with taint indicator
+                if _has_taint_indicator(content):
+                    results.append(
+                        RuleResult(
+                            rule_id=self.id,
+                            severity=self.default_severity,
+                            message="File operation with user-controlled input indicator",
+                            file=path,
+                            line=lineno,
+                            evidence=content.strip(),
                         )
-                        continue
-
-                    # Check for traversal patterns in file operations
-                    if _FILE_OPS_RE.search(content) and _has_traversal_pattern(content):
-                        results.append(
-                            RuleResult(
-                                rule_id=self.id,
-                                severity=self.default_severity,
-                                message="Path traversal pattern in file operation",
-                                file=f.path,
-                                line=line.new_lineno,
-                                evidence=content.strip(),
-                            )
+                    )
+                    continue
+
+                # Check for traversal patterns in file operations
+                if _has_traversal_pattern(content):
+                    results.append(
+                        RuleResult(
+                            rule_id=self.id,
+                            severity=self.default_severity,
+                            message="Path traversal pattern in file operation",
+                            file=path,
+                            line=lineno,
+                            evidence=content.strip(),
                         )
+                    )
 
         return results
@@ -36,27 +36,54 @@ _SECRET_PATTERNS: list[tuple[str, re.Pattern[str], RuleSeverity]] = [
     ),
 ]
 
-# Known placeholder values that should not trigger findings
-_PLACEHOLDERS = frozenset(
-    {
-        "changeme",
-        "xxxx",
-        "example",
-        "placeholder",
-        "your-",
-        "your_",
-        "test",
-        "dummy",
-        "fake",
-        "mock",
-        "sample",
-        "todo",
-        "fixme",
-        "replace",
-    }
+
+def _union(patterns: list[tuple[str, re.Pattern[str], RuleSeverity]]) -> re.Pattern[str]:
+    """Fold *patterns* into one alternation, scoping IGNORECASE to the patterns that set it."""
+    parts = [
+        f"(?i:{pattern.pattern})" if pattern.flags & re.IGNORECASE else f"(?:{pattern.pattern})"
+        for _, pattern, _ in patterns
+    ]
+    return re.compile("|".join(parts))
+
+
+# One C-level pass rejects the vast majority of lines before the ordered per-pattern loop
+_SECRET_UNION = _union(_SECRET_PATTERNS)
+
+# Literal prefixes every secret pattern starts with — a cheaper scan than the union,
+# so text without any of them never reaches it. Keep in sync with _SECRET_PATTERNS.
+_SECRET_TRIGGER_RE = re.compile(
+    r"-----BEGIN|AKIA|gh[pousr]_|github_pat_|sk-|(?i:token|secret|password|api_key)"
 )
 
 
+def _may_contain_secret(text: str) -> bool:
+    """Check *text* against the trigger literals, then the full secret union."""
+    return bool(_SECRET_TRIGGER_RE.search(text)) and bool(_SECRET_UNION.search(text))
+
+
+# Known placeholder values that should not trigger findings, longest first so the
+# alternation built from them is deterministic and tries the longer literals first
+_PLACEHOLDER_LIST = (
+    "placeholder",
+    "changeme",
+    "example",
+    "replace",
+    "sample",
+    "dummy",
+    "fixme",
+    "your-",
+    "your_",
+    "xxxx",
+    "test",
+    "fake",
+    "mock",
+    "todo",
+)
+_PLACEHOLDERS = frozenset(_PLACEHOLDER_LIST)
+
+_PLACEHOLDER_RE = re.compile("|".join(map(re.escape, _PLACEHOLDER_LIST)), re.IGNORECASE)
+
+
 def _is_comment_line(content: str) -> bool:
     """Check if a line is a comment in common languages."""
     stripped = content.strip()
@@ -65,8 +92,7 @@ def _is_comment_line(content: str) -> bool:
 
 def _is_placeholder(match_text: str) -> bool:
     """Check if matched text contains a known placeholder value."""
-    lower = match_text.lower()
-    return any(p in lower for p in _PLACEHOLDERS)
+    return _PLACEHOLDER_RE.search(match_text) is not None
 
 
 def _in_tests_dir(path: str) -> bool:
@@ -83,7 +109,14 @@ class SecretsInDiffRule:
 
     def run(self, ctx: RuleContext) -> list[RuleResult]:
         results: list[RuleResult] = []
+        seen: set[str] = set()
         for f in ctx.files:
+            # A path listed twice (e.g. concatenated per-commit diffs) shares one
+            # added-line index, so scanning it again would duplicate every finding
+            if f.path in seen:
+                continue
+            seen.add(f.path)
+
             # Skip test directories
             if _in_tests_dir(f.path):
                 continue
@@ -106,27 +139,28 @@ class SecretsInDiffRule:
                             break  # One finding per .env file is enough
                     break  # Only need one hunk
 
-            # Scan added lines for secret patterns
-            for hunk in f.hunks:
-                for line in hunk.lines:
-                    if line.type != "add" or line.new_lineno is None:
-                        continue
-                    if _is_comment_line(line.content):
-                        continue
-                    for name, pattern, severity in _SECRET_PATTERNS:
-                        match = pattern.search(line.content)
-                        if match and not _is_placeholder(match.group(0)):
-                            results.append(
-                                RuleResult(
-                                    rule_id=self.id,
-                                    severity=severity,
-                                    message=f"{name} detected in diff",
-                                    file=f.path,
-                                    line=line.new_lineno,
-                                    evidence=self._redact(match.group(0)),
-                                )
+            # Scan added lines for secret patterns (whole-file reject first)
+            if not _may_contain_secret(ctx.added_text_in(f.path)):
+                continue
+            for lineno, content in ctx.added_lines_in(f.path):
+                if not _may_contain_secret(content):
+                    continue
+                if _is_comment_line(content):
+                    continue
+                for name, pattern, severity in _SECRET_PATTERNS:
+                    match = pattern.search(content)
+                    if match and not _is_placeholder(match.group(0)):
+                        results.append(
+                            RuleResult(
+                                rule_id=self.id,
+                                severity=severity,
+                                message=f"{name} detected in diff",
+                                file=f.path,
+                                line=lineno,
+                                evidence=self._redact(match.group(0)),
                             )
-                            break  # One finding per line is enough
+                        )
+                        break  # One finding per line is enough
 
         return results
 
@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+import bisect
+import itertools
 import re
 
 from grippy.rules.base import RuleResult, RuleSeverity
@@ -12,34 +14,79 @@ _WORKFLOW_PREFIX = ".github/workflows/"
 _WORKFLOW_EXTENSIONS = (".yml", ".yaml")
 
 # SHA pinning: uses: org/action@<40-hex-chars>
-_SHA_PIN_RE = re.compile(r"@[0-9a-f]{40}\b")
-_USES_RE = re.compile(r"^\s*-?\s*uses:\s*(.+)$")
-_PERMISSIONS_RE = re.compile(r"^(\s*)permissions\s*:")
+_SHA_LEN = 40
+_HEX_DIGITS = b"0123456789abcdef"
+_PERMISSIONS_RE = re.compile(r"(\s*)permissions\s*:")  # used with .match(), already anchored
 _PR_TARGET_RE = re.compile(r"\bpull_request_target\b")
 _WRITE_ADMIN_RE = re.compile(r"\b(write|admin)\b")
 
+# Any line the per-line checks below could act on matches this — one scan skips the rest
+_TRIGGER_LITERALS = ("permissions", "uses:", "pull_request_target")
+_TRIGGER_RE = re.compile(r"^\s*(?:permissions\s*:|-?\s*uses:)|\bpull_request_target\b")
+
+
+def _uses_ref(content: str) -> str | None:
+    """Return the stripped action ref of a ``[- ]uses: <ref>`` line, else None."""
+    s = content.lstrip()
+    if s.startswith("-"):
+        s = s[1:].lstrip()
+    if not s.startswith("uses:") or len(s) == len("uses:"):
+        return None
+    return s[len("uses:") :].strip()
+
+
+def _is_sha_pinned(action_ref: str) -> bool:
+    """Check for ``@`` followed by exactly 40 lowercase hex digits ending at a word boundary."""
+    at = action_ref.find("@")
+    while at != -1:
+        sha = action_ref[at + 1 : at + 1 + _SHA_LEN]
+        # Deleting every hex digit in C leaves nothing iff the candidate is all lowercase hex
+        if len(sha) == _SHA_LEN and sha.isascii() and not sha.encode().translate(None, _HEX_DIGITS):
+            after = action_ref[at + 1 + _SHA_LEN : at + 2 + _SHA_LEN]
+            if not (after.isalnum() or after == "_"):
+                return True
+        at = action_ref.find("@", at + 1)
+    return False
+
+
+def _matching_lines(pattern: re.Pattern[str], buf: str, contents: list[str]) -> set[int]:
+    """Return indices of the *contents* lines *pattern* matches, from one scan of *buf*.
+
+    *buf* is ``"\n".join(contents)``; only valid for patterns that cannot match
+    across a newline.
+    """
+    matches = list(pattern.finditer(buf))
+    if not matches:
+        return set()
+    line_starts = list(itertools.accumulate((len(c) + 1 for c in contents), initial=0))
+    return {bisect.bisect_right(line_starts, m.start()) - 1 for m in matches}
+
+
+def _has_write_admin(text: str) -> bool:
+    """Check for a write/admin word — plain substring tests reject most lines first."""
+    return ("write" in text or "admin" in text) and _WRITE_ADMIN_RE.search(text) is not None
+
 
 def _indent_level(line: str) -> int:
     """Return number of leading spaces."""
     return len(line) - len(line.lstrip())
 
 
-def _collect_hunk_lines(hunk: DiffHunk) -> list[tuple[str, DiffLine]]:
-    """Collect (raw_content, DiffLine) pairs preserving added + context lines."""
-    results: list[tuple[str, DiffLine]] = []
-    for dl in hunk.lines:
-        if dl.type in ("add", "context"):
-            results.append((dl.content, dl))
-    return results
+def _collect_hunk_lines(hunk: DiffHunk) -> tuple[list[str], list[DiffLine]]:
+    """Collect parallel (raw_content, DiffLine) lists preserving added + context lines."""
+    dlines = [dl for dl in hunk.lines if dl.type in ("add", "context")]
+    return [dl.content for dl in dlines], dlines
 
 
-def _is_near_added(lines: list[tuple[str, DiffLine]], idx: int, proximity: int = 2) -> bool:
-    """Check if any line within ±proximity of idx is an added line."""
-    for offset in range(-proximity, proximity + 1):
-        check = idx + offset
-        if 0 <= check < len(lines) and lines[check][1].type == "add":
-            return True
-    return False
+def _near_added_mask(dlines: list[DiffLine], proximity: int = 2) -> list[bool]:
+    """For each line, whether any line within ±proximity of it is an added line."""
+    # adds_before[i] = number of added lines in dlines[:i]
+    adds_before = [0, *itertools.accumulate(dl.type == "add" for dl in dlines)]
+    n = len(dlines)
+    return [
+        adds_before[min(n, i + proximity + 1)] > adds_before[max(0, i - proximity)]
+        for i in range(n)
+    ]
 
 
 class WorkflowPermissionsRule:
@@ -51,45 +98,65 @@ class WorkflowPermissionsRule:
 
     def run(self, ctx: RuleContext) -> list[RuleResult]:
         results: list[RuleResult] = []
-        for f in ctx.files:
-            if not f.path.startswith(_WORKFLOW_PREFIX) or not f.path.endswith(_WORKFLOW_EXTENSIONS):
-                continue
+        prefix, extensions = _WORKFLOW_PREFIX, _WORKFLOW_EXTENSIONS
+        workflow_files = [
+            f
+            for f in ctx.files
+            if (path := f.path).startswith(prefix) and path.endswith(extensions)
+        ]
+        for f in workflow_files:
             for hunk in f.hunks:
-                results.extend(self._scan_hunk(f, hunk))
+                self._scan_hunk(f, hunk, results)
         return results
 
-    def _scan_hunk(self, f: ChangedFile, hunk: DiffHunk) -> list[RuleResult]:
-        results: list[RuleResult] = []
-        lines = _collect_hunk_lines(hunk)
+    def _scan_hunk(self, f: ChangedFile, hunk: DiffHunk, results: list[RuleResult]) -> None:
+        """Append the hunk's findings to *results*."""
+        # Bound once — read for every finding built below
+        rule_id, path = self.id, f.path
+        error, warn = RuleSeverity.ERROR, RuleSeverity.WARN
+        contents, dlines = _collect_hunk_lines(hunk)
+        buf = "\n".join(contents)
+        # Every check below needs one of these literals; most hunks have none
+        if not any(literal in buf for literal in _TRIGGER_LITERALS):
+            return
+        near_added = _near_added_mask(dlines)
+        pr_target_lines = _matching_lines(_PR_TARGET_RE, buf, contents)
+
+        for i, content in enumerate(contents):
+            if not _TRIGGER_RE.search(content):
+                continue
+            dl = dlines[i]
 
-        for i, (content, dl) in enumerate(lines):
             # Check permissions: blocks
             perm_match = _PERMISSIONS_RE.match(content)
             if perm_match:
                 # Check scalar permissions on same line (e.g. "permissions: write-all")
                 remainder = content[perm_match.end() :]
-                if _WRITE_ADMIN_RE.search(remainder) and _is_near_added(lines, i):
+                if _has_write_admin(remainder) and near_added[i]:
                     results.append(
                         RuleResult(
-                            rule_id=self.id,
-                            severity=RuleSeverity.ERROR,
+                            rule_id=rule_id,
+                            severity=error,
                             message="Workflow permissions expanded to write/admin",
-                            file=f.path,
+                            file=path,
                             line=dl.new_lineno or dl.old_lineno,
                             evidence=content.strip(),
                         )
                     )
                 # Also check block-style indented children
-                results.extend(self._check_permissions_block(f, lines, i))
+                # group(1) is the line's full leading whitespace, i.e. its indent level
+                self._check_permissions_block(
+                    f, contents, dlines, near_added, i, len(perm_match.group(1)), results
+                )
 
             # Check pull_request_target
-            if _PR_TARGET_RE.search(content) and _is_near_added(lines, i):
+            if i in pr_target_lines and near_added[i]:
                 results.append(
                     RuleResult(
-                        rule_id=self.id,
-                        severity=RuleSeverity.ERROR,
+                        rule_id=rule_id,
+                        severity=error,
                         message="pull_request_target trigger detected — runs with base repo secrets",
-                        file=f.path,
+                        file=path,
                         line=dl.new_lineno or dl.old_lineno,
                         evidence=content.strip(),
                     )
@@ -97,53 +164,52 @@ class WorkflowPermissionsRule:
 
             # Check unpinned actions (only on added lines)
             if dl.type == "add":
-                uses_match = _USES_RE.match(content)
-                if uses_match:
-                    action_ref = uses_match.group(1).strip()
+                action_ref = _uses_ref(content)
+                if action_ref is not None:
                     # Skip local actions (./), docker://, and already SHA-pinned
                     if (
                         not action_ref.startswith("./")
                         and not action_ref.startswith("docker://")
-                        and not _SHA_PIN_RE.search(action_ref)
+                        and not _is_sha_pinned(action_ref)
                     ):
                         results.append(
                             RuleResult(
-                                rule_id=self.id,
-                                severity=RuleSeverity.WARN,
+                                rule_id=rule_id,
+                                severity=warn,
                                 message=f"Unpinned action — use SHA instead of tag: {action_ref}",
-                                file=f.path,
+                                file=path,
                                 line=dl.new_lineno,
                                 evidence=content.strip(),
                             )
                         )
 
-        return results
-
     def _check_permissions_block(
         self,
         f: ChangedFile,
-        lines: list[tuple[str, DiffLine]],
+        contents: list[str],
+        dlines: list[DiffLine],
+        near_added: list[bool],
         perm_idx: int,
-    ) -> list[RuleResult]:
-        """Scan indented children of a permissions: block for write/admin."""
-        results: list[RuleResult] = []
-        base_indent = _indent_level(lines[perm_idx][0])
-
-        for j in range(perm_idx + 1, len(lines)):
-            child_content, child_dl = lines[j]
+        base_indent: int,
+        results: list[RuleResult],
+    ) -> None:
+        """Scan indented children of a permissions: block for write/admin into *results*."""
+        rule_id, path, error = self.id, f.path, RuleSeverity.ERROR
+
+        for j in range(perm_idx + 1, len(contents)):
+            child_content = contents[j]
             child_indent = _indent_level(child_content)
             if child_indent <= base_indent:
                 break
-            if _WRITE_ADMIN_RE.search(child_content) and _is_near_added(lines, j):
+            child_dl = dlines[j]
+            if _has_write_admin(child_content) and near_added[j]:
                 results.append(
                     RuleResult(
-                        rule_id=self.id,
-                        severity=RuleSeverity.ERROR,
+                        rule_id=rule_id,
+                        severity=error,
                         message="Workflow permissions expanded to write/admin",
-                        file=f.path,
+                        file=path,
                         line=child_dl.new_lineno or child_dl.old_lineno,
                         evidence=child_content.strip(),
                     )
                 )
-
-        return results
@@ -0,0 +1,30 @@
+# SPDX-License-Identifier: MIT
+"""Shared diff/context builders for the per-rule test modules."""
+
+from __future__ import annotations
+
+import functools
+
+from grippy.rules.base import RuleSeverity
+from grippy.rules.config import ProfileConfig
+from grippy.rules.context import RuleContext, parse_diff
+
+SECURITY_CFG = ProfileConfig(name="security", fail_on=RuleSeverity.ERROR)
+
+
+@functools.cache
+def ctx(diff: str) -> RuleContext:
+    """Security-profile context for *diff*, memoized — rules only read it."""
+    return RuleContext(diff=diff, files=parse_diff(diff), config=SECURITY_CFG)
+
+
+def make_diff(path: str, *added_lines: str) -> str:
+    """One-hunk diff of *path* adding *added_lines* after a single context line."""
+    header = (
+        f"diff --git a/{path} b/{path}\n"
+        f"--- a/{path}\n"
+        f"+++ b/{path}\n"
+        f"@@ -1,1 +1,{len(added_lines) + 1} @@\n"
+        " existing\n"
+    )
+    return header + "".join(f"+{line}\n" for line in added_lines)
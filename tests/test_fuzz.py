@@ -25,6 +25,11 @@ from grippy.rules.context import ChangedFile, DiffLine, parse_diff
 # Initial 10k spike across all 8 tests passed clean (80k total inputs).
 _MAX_EXAMPLES = 50_000 if os.environ.get("FUZZ_SLOW") else 2_000
 
+# Shared by every test below. No deadline: per-example timing adds overhead and
+# these tests check crash-freedom, not latency. Failing examples are still saved
+# to and replayed from hypothesis' default .hypothesis/ example database.
+_FUZZ_SETTINGS = settings(max_examples=_MAX_EXAMPLES, deadline=None)
+
 _PRINTABLE = st.text(alphabet=string.printable, min_size=0, max_size=200)
 
 _DIFF_LINE = st.one_of(
@@ -43,12 +48,24 @@ _HUNK_HEADER = st.builds(
     st.integers(min_value=0, max_value=999),
 )
 
-_FILE_NAME = st.from_regex(r"[a-z][a-z0-9_/]{0,40}\.(py|yml|js|ts|md)", fullmatch=True)
+# Same language as [a-z][a-z0-9_/]{0,40}\.(py|yml|js|ts|md), without from_regex's
+# per-draw overhead (it dominated example generation)
+_FILE_NAME = st.builds(
+    lambda head, tail, ext: f"{head}{tail}.{ext}",
+    st.sampled_from(string.ascii_lowercase),
+    st.text(alphabet=string.ascii_lowercase + string.digits + "_/", max_size=40),
+    st.sampled_from(("py", "yml", "js", "ts", "md")),
+)
+
+
+def _build_diff_block(fname: str, hunk: str, lines: list[str]) -> str:
+    return "\n".join(
+        ("diff --git a/" + fname + " b/" + fname, "--- a/" + fname, "+++ b/" + fname, hunk, *lines)
+    )
+
 
 _DIFF_BLOCK = st.builds(
-    lambda fname, hunk, lines: (
-        f"diff --git a/{fname} b/{fname}\n--- a/{fname}\n+++ b/{fname}\n{hunk}\n" + "\n".join(lines)
-    ),
+    _build_diff_block,
     _FILE_NAME,
     _HUNK_HEADER,
     st.lists(_DIFF_LINE, min_size=1, max_size=30),
@@ -61,14 +78,16 @@ _FULL_DIFF = st.builds(
 
 
 # ---------------------------------------------------------------------------
-# Fuzz: parse_diff (rules/context.py) — never crashes, returns valid types
+# Fuzz: parse_diff (rules/context.py) + parse_diff_lines (github_review.py) —
+# never crash, return valid types. Each drawn input goes through every parser
+# that shares its strategy, so it is generated once.
 # ---------------------------------------------------------------------------
 
 
 @given(diff_text=_FULL_DIFF)
-@settings(max_examples=_MAX_EXAMPLES)
-def test_fuzz_parse_diff_structured(diff_text: str) -> None:
-    """parse_diff never crashes on structured diff-like input."""
+@_FUZZ_SETTINGS
+def test_fuzz_parsers_structured(diff_text: str) -> None:
+    """parse_diff and parse_diff_lines never crash on structured diff-like input."""
     result = parse_diff(diff_text)
     assert isinstance(result, list)
     for f in result:
@@ -79,27 +98,9 @@ def test_fuzz_parse_diff_structured(diff_text: str) -> None:
                 assert isinstance(line, DiffLine)
                 assert line.type in ("add", "remove", "context")
 
-
-@given(diff_text=_PRINTABLE)
-@settings(max_examples=_MAX_EXAMPLES)
-def test_fuzz_parse_diff_arbitrary(diff_text: str) -> None:
-    """parse_diff never crashes on arbitrary string input."""
-    result = parse_diff(diff_text)
-    assert isinstance(result, list)
-
-
-# ---------------------------------------------------------------------------
-# Fuzz: parse_diff_lines (github_review.py) — never crashes, valid types
-# ---------------------------------------------------------------------------
-
-
-@given(diff_text=_FULL_DIFF)
-@settings(max_examples=_MAX_EXAMPLES)
-def test_fuzz_parse_diff_lines_structured(diff_text: str) -> None:
-    """parse_diff_lines never crashes on structured diff-like input."""
-    result = parse_diff_lines(diff_text)
-    assert isinstance(result, dict)
-    for path, lines in result.items():
+    addressable = parse_diff_lines(diff_text)
+    assert isinstance(addressable, dict)
+    for path, lines in addressable.items():
         assert isinstance(path, str)
         assert isinstance(lines, set)
         for ln in lines:
@@ -107,32 +108,25 @@ def test_fuzz_parse_diff_lines_structured(diff_text: str) -> None:
             assert ln >= 0
 
 
-@given(diff_text=_PRINTABLE)
-@settings(max_examples=_MAX_EXAMPLES)
-def test_fuzz_parse_diff_lines_arbitrary(diff_text: str) -> None:
-    """parse_diff_lines never crashes on arbitrary string input."""
-    result = parse_diff_lines(diff_text)
-    assert isinstance(result, dict)
+@given(text=_PRINTABLE)
+@_FUZZ_SETTINGS
+def test_fuzz_parsers_arbitrary(text: str) -> None:
+    """parse_diff, parse_diff_lines and _strip_markdown_fences never crash on arbitrary text."""
+    assert isinstance(parse_diff(text), list)
+    assert isinstance(parse_diff_lines(text), dict)
+    assert isinstance(_strip_markdown_fences(text), str)
 
 
 # ---------------------------------------------------------------------------
-# Fuzz: _strip_markdown_fences (retry.py) — never crashes, returns str
+# Fuzz: _strip_markdown_fences (retry.py) — extracts fenced content
 # ---------------------------------------------------------------------------
 
 
-@given(text=_PRINTABLE)
-@settings(max_examples=_MAX_EXAMPLES)
-def test_fuzz_strip_markdown_fences(text: str) -> None:
-    """_strip_markdown_fences never crashes and always returns a string."""
-    result = _strip_markdown_fences(text)
-    assert isinstance(result, str)
-
-
 @given(
     inner=_PRINTABLE,
     lang=st.sampled_from(["json", "python", ""]),
 )
-@settings(max_examples=_MAX_EXAMPLES)
+@_FUZZ_SETTINGS
 def test_fuzz_strip_markdown_fences_wrapped(inner: str, lang: str) -> None:
     """_strip_markdown_fences extracts content from fenced blocks."""
     wrapped = f"```{lang}\n{inner}\n```"
@@ -144,40 +138,51 @@ def test_fuzz_strip_markdown_fences_wrapped(inner: str, lang: str) -> None:
 # Fuzz: parse_diff edge cases — deleted files, renames, binary files
 # ---------------------------------------------------------------------------
 
+
+def _build_deleted_file_diff(fname: str, lines: list[str]) -> str:
+    return "\n".join(
+        (
+            "diff --git a/" + fname + " b/" + fname,
+            "deleted file mode 100644",
+            "--- a/" + fname,
+            "+++ /dev/null",
+            "@@ -1," + str(len(lines)) + " +0,0 @@",
+            *["-" + ln for ln in lines],
+        )
+    )
+
+
+def _build_rename_diff(old: str, new: str) -> str:
+    return "\n".join(
+        (
+            "diff --git a/" + old + " b/" + new,
+            "similarity index 95%",
+            "rename from " + old,
+            "rename to " + new,
+            "--- a/" + old,
+            "+++ b/" + new,
+            "@@ -1,3 +1,3 @@",
+            " unchanged",
+            "-old line",
+            "+new line",
+            "",
+        )
+    )
+
+
 _DELETED_FILE_DIFF = st.builds(
-    lambda fname, lines: (
-        f"diff --git a/{fname} b/{fname}\n"
-        f"deleted file mode 100644\n"
-        f"--- a/{fname}\n"
-        f"+++ /dev/null\n"
-        f"@@ -1,{len(lines)} +0,0 @@\n" + "\n".join(f"-{ln}" for ln in lines)
-    ),
+    _build_deleted_file_diff,
     _FILE_NAME,
     st.lists(
         st.text(alphabet=string.ascii_letters, min_size=1, max_size=40), min_size=1, max_size=10
     ),
 )
 
-_RENAME_DIFF = st.builds(
-    lambda old, new: (
-        f"diff --git a/{old} b/{new}\n"
-        f"similarity index 95%\n"
-        f"rename from {old}\n"
-        f"rename to {new}\n"
-        f"--- a/{old}\n"
-        f"+++ b/{new}\n"
-        f"@@ -1,3 +1,3 @@\n"
-        f" unchanged\n"
-        f"-old line\n"
-        f"+new line\n"
-    ),
-    _FILE_NAME,
-    _FILE_NAME,
-)
+_RENAME_DIFF = st.builds(_build_rename_diff, _FILE_NAME, _FILE_NAME)
 
 
 @given(diff_text=_DELETED_FILE_DIFF)
-@settings(max_examples=_MAX_EXAMPLES)
+@_FUZZ_SETTINGS
 def test_fuzz_parse_diff_deleted_files(diff_text: str) -> None:
     """parse_diff handles deleted file diffs."""
     result = parse_diff(diff_text)
@@ -187,7 +192,7 @@ def test_fuzz_parse_diff_deleted_files(diff_text: str) -> None:
 
 
 @given(diff_text=_RENAME_DIFF)
-@settings(max_examples=_MAX_EXAMPLES)
+@_FUZZ_SETTINGS
 def test_fuzz_parse_diff_renames(diff_text: str) -> None:
     """parse_diff handles rename diffs."""
     result = parse_diff(diff_text)
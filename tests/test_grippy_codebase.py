@@ -135,6 +135,27 @@ class TestWalkSourceFiles:
             files = walk_source_files(tmp_repo)
             assert len(files) > 0
 
+    def test_fallback_skips_glob_ignored_dirs(self, tmp_repo: Path) -> None:
+        """The manual walk prunes directories matching an ignore glob, not just exact names."""
+        (tmp_repo / "pkg.egg-info").mkdir()
+        (tmp_repo / "pkg.egg-info" / "meta.py").write_text("x = 1\n")
+        (tmp_repo / "vendor").mkdir()
+        (tmp_repo / "vendor" / "lib.py").write_text("y = 2\n")
+        with patch("grippy.codebase.subprocess.run", side_effect=FileNotFoundError):
+            files = walk_source_files(tmp_repo)
+            custom = walk_source_files(tmp_repo, ignore_dirs=frozenset({"vend*"}))
+        assert not any("egg-info" in str(f) for f in files)
+        assert any(f.name == "lib.py" for f in files)
+        assert not any(f.name == "lib.py" for f in custom)
+
+    def test_fallback_accepts_plain_set_of_ignore_dirs(self, tmp_repo: Path) -> None:
+        """A mutable set of ignore dirs still works with the cached matcher."""
+        (tmp_repo / "vendor").mkdir()
+        (tmp_repo / "vendor" / "lib.py").write_text("y = 2\n")
+        with patch("grippy.codebase.subprocess.run", side_effect=FileNotFoundError):
+            files = walk_source_files(tmp_repo, ignore_dirs={"vend*"})  # type: ignore[arg-type]
+        assert not any(f.name == "lib.py" for f in files)
+
 
 # --- chunk_file tests ---
 
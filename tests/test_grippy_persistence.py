@@ -3,82 +3,215 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import hashlib
 import sqlite3
+import tempfile
 from pathlib import Path
+from typing import Any
 
 import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
 
 from grippy.graph import NodeType
 from grippy.persistence import _NODE_ID_RE, GrippyStore, _record_id
 
+# lancedb is the optional "persistence" extra; GrippyStore imports it lazily
+pytest.importorskip("lancedb")
+
 EMBED_DIM = 8
 
+# Byte value -> normalized float, so fake embeddings need no per-call division
+_BYTE_TO_FLOAT: tuple[float, ...] = tuple(i / 255.0 for i in range(256))
+
+# Constant vectors for tests that feed _upsert_vectors directly
+_VEC_ZERO = (0.0,) * EMBED_DIM
+_VEC_LOW = (0.1,) * EMBED_DIM
+_VEC_MID = (0.5,) * EMBED_DIM
+_VEC_HIGH = (0.9,) * EMBED_DIM
+
+
+@functools.lru_cache(maxsize=1024)
+def _fake_embed(text: str) -> tuple[float, ...]:
+    """Deterministic hash-based vector of EMBED_DIM floats in [0, 1], memoized."""
+    # Any stable hash will do — nothing here needs SHA-256's security properties
+    h = hashlib.blake2b(text.encode(), digest_size=EMBED_DIM).digest()
+    return tuple([_BYTE_TO_FLOAT[b] for b in h])
+
+
+def _fake_vector(text: str) -> list[float]:
+    """A fresh list per call, so callers can't mutate the cached vector."""
+    return list(_fake_embed(text))
+
 
 class _FakeEmbedder:
     """Deterministic fake embedder — hash-based, fixed dimension."""
 
     def get_embedding(self, text: str) -> list[float]:
-        import hashlib
+        return _fake_vector(text)
+
+
+def _seed_db(db_path: Path, script: str) -> None:
+    """Create a legacy-shaped DB in one non-durable transaction."""
+    # closing() so a failing script can't leak the handle (and block tmp_path cleanup)
+    with contextlib.closing(sqlite3.connect(str(db_path))) as conn:
+        conn.executescript(
+            "PRAGMA synchronous=OFF; PRAGMA journal_mode=MEMORY; BEGIN; " + script + " COMMIT;"
+        )
+
 
-        h = hashlib.sha256(text.encode()).digest()
-        return [float(b) / 255.0 for b in h[:EMBED_DIM]]
+def _schema(conn: sqlite3.Connection) -> dict[str, frozenset[str]]:
+    """Map every table to its column names with a single introspection query."""
+    rows = conn.execute(
+        "SELECT m.name, p.name FROM sqlite_master AS m, pragma_table_info(m.name) AS p "
+        "WHERE m.type = 'table'"
+    )
+    columns: dict[str, set[str]] = {}
+    for table, column in rows:
+        columns.setdefault(table, set()).add(column)
+    return {table: frozenset(cols) for table, cols in columns.items()}
+
+
+def _row_counts(conn: sqlite3.Connection) -> tuple[int, int]:
+    """(nodes, edges) row counts in one statement."""
+    row = conn.execute(
+        "SELECT (SELECT COUNT(*) FROM nodes), (SELECT COUNT(*) FROM edges)"
+    ).fetchone()
+    return row[0], row[1]
+
+
+@pytest.fixture(scope="session")
+def lance_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """One parent directory for every per-test LanceDB dir."""
+    return tmp_path_factory.mktemp("lance_root")
 
 
 @pytest.fixture()
-def store(tmp_path: Path) -> GrippyStore:
-    """Create a GrippyStore with temp dirs for both databases."""
+def lance_dir(lance_root: Path) -> Path:
+    """A fresh LanceDB directory under the shared parent."""
+    return Path(tempfile.mkdtemp(dir=lance_root))
+
+
+@pytest.fixture(scope="module")
+def _module_store(lance_root: Path) -> GrippyStore:
+    """One GrippyStore per module — schema and LanceDB bootstrap happen once."""
+    return GrippyStore(
+        graph_db_path=":memory:",
+        lance_dir=Path(tempfile.mkdtemp(dir=lance_root)),
+        embedder=_FakeEmbedder(),
+    )
+
+
+def _reset_store(store: GrippyStore) -> GrippyStore:
+    """Empty both the SQLite graph and the LanceDB table."""
+    store._conn.executescript("DELETE FROM edges; DELETE FROM nodes;")
+    store._lance_db.drop_table("nodes", ignore_missing=True)
+    store._nodes_table = None
+    return store
+
+
+@pytest.fixture()
+def store(_module_store: GrippyStore) -> GrippyStore:
+    """The shared GrippyStore (in-memory SQLite graph), emptied for each test."""
+    return _reset_store(_module_store)
+
+
+@pytest.fixture(scope="module")
+def _module_cursor(_module_store: GrippyStore) -> sqlite3.Cursor:
+    """One cursor on the shared store for the whole module."""
+    return _module_store._conn.cursor()
+
+
+@pytest.fixture()
+def cur(store: GrippyStore, _module_cursor: sqlite3.Cursor) -> sqlite3.Cursor:
+    """The module cursor, handed out after the store has been emptied."""
+    return _module_cursor
+
+
+@pytest.fixture()
+def store_on_disk(tmp_path: Path, lance_dir: Path) -> GrippyStore:
+    """Create a GrippyStore with temp dirs for both databases (file-backed SQLite)."""
     return GrippyStore(
         graph_db_path=tmp_path / "grippy-graph.db",
-        lance_dir=tmp_path / "lance",
+        lance_dir=lance_dir,
         embedder=_FakeEmbedder(),
     )
 
 
+def _insert_nodes(store: GrippyStore, nodes: list[dict[str, Any]]) -> None:
+    """Insert nodes into SQLite and LanceDB — one transaction, one embed batch, one append."""
+    store._upsert_sqlite(nodes, [])
+    vecs = store._compute_embeddings([f"{n['type']} {n['label']}" for n in nodes])
+    store._upsert_vectors(nodes, vecs)
+
+
+@pytest.fixture(scope="class")
+def populated(_module_store: GrippyStore) -> GrippyStore:
+    """Insert one node into both SQLite and LanceDB, shared by the read-only tests."""
+    store = _reset_store(_module_store)
+    nodes = [
+        {
+            "id": "FILE:abcdef012345",
+            "type": "FILE",
+            "label": "src/app.py",
+            "data": '{"path": "src/app.py"}',
+            "session_id": "pr-1",
+            "status": None,
+            "fingerprint": None,
+            "created_at": "2026-01-01",
+            "updated_at": "2026-01-01",
+        }
+    ]
+    _insert_nodes(store, nodes)
+    return store
+
+
 # --- _record_id ---
 
+# (_record_id args, expected ID) — sha256("{type}:{parts}")[:12], computed once
+_KNOWN_IDS: tuple[tuple[tuple[str, ...], str], ...] = (
+    ((NodeType.FILE, "src/app.py"), "FILE:7ce9a6e316b1"),
+    ((NodeType.RULE, "src/app.py"), "RULE:286dfae97b3b"),
+    (("CUSTOM", "some_value"), "CUSTOM:5c3eec6a91fd"),
+)
+
 
 class TestRecordId:
-    def test_deterministic(self) -> None:
-        """Same inputs produce the same ID."""
-        id1 = _record_id(NodeType.FILE, "src/app.py")
-        id2 = _record_id(NodeType.FILE, "src/app.py")
-        assert id1 == id2
-
-    def test_includes_type_prefix(self) -> None:
-        """IDs are prefixed with node type."""
-        nid = _record_id(NodeType.FILE, "src/app.py")
-        assert nid.startswith("FILE:")
-
-    def test_different_inputs_different_ids(self) -> None:
-        """Different inputs produce different IDs."""
-        id1 = _record_id(NodeType.FILE, "a.py")
-        id2 = _record_id(NodeType.FILE, "b.py")
-        assert id1 != id2
-
-    def test_accepts_string_type(self) -> None:
-        """Accepts string node type (not just enum)."""
-        nid = _record_id("CUSTOM", "some_value")
-        assert nid.startswith("CUSTOM:")
-
-    def test_different_types_same_parts_different_digest(self) -> None:
-        """Different node types with the same parts produce different hash digests."""
-        file_id = _record_id(NodeType.FILE, "src/app.py")
-        rule_id = _record_id(NodeType.RULE, "src/app.py")
-        file_digest = file_id.split(":")[1]
-        rule_digest = rule_id.split(":")[1]
-        assert file_digest != rule_digest
+    @settings(max_examples=200, deadline=None)
+    @given(st.sampled_from(list(NodeType)), st.text(min_size=1, max_size=64))
+    def test_id_properties(self, node_type: NodeType, part: str) -> None:
+        """IDs are deterministic, type-prefixed, and vary with both type and parts."""
+        nid = _record_id(node_type, part)
+        assert nid == _record_id(node_type, part)
+        assert nid.startswith(f"{node_type.value}:")
+        assert nid != _record_id(node_type, part + "x")
+        digest = nid.split(":")[1]
+        for other in NodeType:
+            if other is not node_type:
+                assert _record_id(other, part).split(":")[1] != digest
+
+    def test_known_ids(self) -> None:
+        """Pinned IDs: the format must stay stable across releases (stored graphs key on it)."""
+        for args, expected in _KNOWN_IDS:
+            assert _record_id(*args) == expected
+
+    def test_enum_and_value_string_give_same_id(self) -> None:
+        """A NodeType member and its value string hash identically."""
+        assert _record_id(NodeType.FILE, "src/app.py") == _record_id("FILE", "src/app.py")
 
 
 # --- Construction ---
 
 
 class TestGrippyStoreInit:
-    def test_creates_sqlite_file(self, tmp_path: Path) -> None:
+    def test_creates_sqlite_file(self, tmp_path: Path, lance_dir: Path) -> None:
         """SQLite database file is created on init."""
         db_path = tmp_path / "grippy-graph.db"
         GrippyStore(
             graph_db_path=db_path,
-            lance_dir=tmp_path / "lance",
+            lance_dir=lance_dir,
             embedder=_FakeEmbedder(),
         )
         assert db_path.exists()
@@ -95,9 +228,7 @@ class TestGrippyStoreInit:
 
     def test_sqlite_schema_has_nodes_table(self, store: GrippyStore) -> None:
         """SQLite has nodes table with expected columns."""
-        cur = store._conn.cursor()
-        cur.execute("PRAGMA table_info(nodes)")
-        columns = {row["name"] for row in cur.fetchall()}
+        columns = _schema(store._conn)["nodes"]
         assert {
             "id",
             "type",
@@ -112,97 +243,81 @@ class TestGrippyStoreInit:
 
     def test_sqlite_schema_has_edges_table(self, store: GrippyStore) -> None:
         """SQLite has edges table with expected columns."""
-        cur = store._conn.cursor()
-        cur.execute("PRAGMA table_info(edges)")
-        columns = {row["name"] for row in cur.fetchall()}
+        columns = _schema(store._conn)["edges"]
         assert {"source", "target", "relationship", "weight", "properties", "created_at"} <= columns
 
-    def test_wal_mode_enabled(self, store: GrippyStore) -> None:
+    def test_wal_mode_enabled(self, store_on_disk: GrippyStore) -> None:
         """WAL journal mode is active."""
-        cur = store._conn.cursor()
+        cur = store_on_disk._conn.cursor()
         cur.execute("PRAGMA journal_mode")
         mode = cur.fetchone()[0]
         assert mode == "wal"
 
-    def test_migrates_v1_schema(self, tmp_path: Path) -> None:
+    def test_migrates_v1_schema(self, tmp_path: Path, lance_dir: Path) -> None:
         """Opening a DB with v1 schema (source_id, edge_type, target_id) drops and recreates."""
         db_path = tmp_path / "grippy-graph.db"
 
         # Create a v1-shaped database
-        conn = sqlite3.connect(str(db_path))
-        conn.execute("CREATE TABLE nodes (id TEXT PRIMARY KEY, type TEXT, label TEXT, data TEXT)")
-        conn.execute(
-            "CREATE TABLE edges (source_id TEXT, edge_type TEXT, target_id TEXT, metadata TEXT)"
+        _seed_db(
+            db_path,
+            "CREATE TABLE nodes (id TEXT PRIMARY KEY, type TEXT, label TEXT, data TEXT); "
+            "CREATE TABLE edges (source_id TEXT, edge_type TEXT, target_id TEXT, metadata TEXT); "
+            "CREATE TABLE node_meta (node_id TEXT PRIMARY KEY, meta TEXT);",
         )
-        conn.execute("CREATE TABLE node_meta (node_id TEXT PRIMARY KEY, meta TEXT)")
-        conn.commit()
-        conn.close()
 
         # Open with GrippyStore — should migrate
         store = GrippyStore(
             graph_db_path=db_path,
-            lance_dir=tmp_path / "lance",
+            lance_dir=lance_dir,
             embedder=_FakeEmbedder(),
         )
 
-        # Verify v2 schema is in place
-        cur = store._conn.cursor()
-        cur.execute("PRAGMA table_info(edges)")
-        columns = {row["name"] for row in cur.fetchall()}
-        assert "source" in columns
-        assert "source_id" not in columns
-
-        # Verify node_meta is gone
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='node_meta'")
-        assert cur.fetchone() is None
+        # Verify v2 schema is in place and node_meta is gone
+        schema = _schema(store._conn)
+        assert "source" in schema["edges"]
+        assert "source_id" not in schema["edges"]
+        assert "node_meta" not in schema
 
-    def test_v1_migration_preserves_v2_nodes(self, tmp_path: Path) -> None:
+    def test_v1_migration_preserves_v2_nodes(self, tmp_path: Path, lance_dir: Path) -> None:
         """v1 edges + v2 nodes (mixed state): migration drops edges but preserves nodes."""
         db_path = tmp_path / "grippy-graph.db"
 
-        conn = sqlite3.connect(str(db_path))
-        # v1 edges
-        conn.execute(
-            "CREATE TABLE edges (source_id TEXT, edge_type TEXT, target_id TEXT, metadata TEXT)"
-        )
-        # v2 nodes (has session_id column)
-        conn.execute(
+        _seed_db(
+            db_path,
+            # v1 edges
+            "CREATE TABLE edges (source_id TEXT, edge_type TEXT, target_id TEXT, metadata TEXT); "
+            # v2 nodes (has session_id column)
             "CREATE TABLE nodes ("
             "id TEXT PRIMARY KEY, type TEXT NOT NULL, label TEXT NOT NULL, "
             "data TEXT NOT NULL DEFAULT '{}', session_id TEXT, status TEXT, "
-            "fingerprint TEXT, created_at TEXT NOT NULL, updated_at TEXT)"
-        )
-        conn.execute(
+            "fingerprint TEXT, created_at TEXT NOT NULL, updated_at TEXT); "
             "INSERT INTO nodes (id, type, label, created_at) "
-            "VALUES ('n1', 'file', 'test', '2026-01-01')"
+            "VALUES ('n1', 'file', 'test', '2026-01-01');",
         )
-        conn.commit()
-        conn.close()
 
         store = GrippyStore(
             graph_db_path=db_path,
-            lance_dir=tmp_path / "lance",
+            lance_dir=lance_dir,
             embedder=_FakeEmbedder(),
         )
 
         # v1 edges should be gone, v2 nodes should be preserved
-        cur = store._conn.cursor()
-        cur.execute("PRAGMA table_info(edges)")
-        edge_cols = {row[1] for row in cur.fetchall()}
+        edge_cols = _schema(store._conn)["edges"]
         assert "source" in edge_cols  # v2 schema
         assert "source_id" not in edge_cols
 
+        cur = store._conn.cursor()
         cur.execute("SELECT COUNT(*) FROM nodes")
         assert cur.fetchone()[0] == 1  # preserved
 
-    def test_v2_schema_not_dropped(self, tmp_path: Path) -> None:
+    def test_v2_schema_not_dropped(self, tmp_path: Path, lance_dir: Path) -> None:
         """Opening a DB that already has v2 schema preserves existing data."""
         db_path = tmp_path / "grippy-graph.db"
 
         # Create store, insert a node manually, close
         store1 = GrippyStore(
             graph_db_path=db_path,
-            lance_dir=tmp_path / "lance",
+            lance_dir=lance_dir,
             embedder=_FakeEmbedder(),
         )
         cur = store1._conn.cursor()
@@ -218,7 +333,7 @@ class TestGrippyStoreInit:
         # Re-open — should NOT drop tables
         store2 = GrippyStore(
             graph_db_path=db_path,
-            lance_dir=tmp_path / "lance",
+            lance_dir=lance_dir,
             embedder=_FakeEmbedder(),
         )
         cur = store2._conn.cursor()
@@ -233,7 +348,7 @@ class TestGrippyStoreInit:
 class TestUpsertSqlite:
     """Direct tests for _upsert_sqlite write operations."""
 
-    def test_upsert_inserts_nodes(self, store: GrippyStore) -> None:
+    def test_upsert_inserts_nodes(self, store: GrippyStore, cur: sqlite3.Cursor) -> None:
         """_upsert_sqlite inserts new nodes."""
         nodes = [
             {
@@ -249,7 +364,6 @@ class TestUpsertSqlite:
             }
         ]
         store._upsert_sqlite(nodes, [])
-        cur = store._conn.cursor()
         cur.execute("SELECT COUNT(*) FROM nodes")
         assert cur.fetchone()[0] == 1
 
@@ -281,11 +395,9 @@ class TestUpsertSqlite:
         ]
         edges = [("FILE:aaa", "REVIEW:bbb", "FOUND_IN", "{}")]
         store._upsert_sqlite(nodes, edges)
-        cur = store._conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM edges")
-        assert cur.fetchone()[0] == 1
+        assert _row_counts(store._conn) == (2, 1)
 
-    def test_upsert_preserves_created_at(self, store: GrippyStore) -> None:
+    def test_upsert_preserves_created_at(self, store: GrippyStore, cur: sqlite3.Cursor) -> None:
         """Re-upserting a node preserves original created_at."""
         node_v1 = {
             "id": "FILE:abc",
@@ -308,7 +420,6 @@ class TestUpsertSqlite:
         }
         store._upsert_sqlite([node_v2], [])
 
-        cur = store._conn.cursor()
         cur.execute("SELECT created_at, updated_at FROM nodes WHERE id = 'FILE:abc'")
         row = cur.fetchone()
         assert row["created_at"] == "2026-01-01"
@@ -319,15 +430,10 @@ class TestUpsertSqlite:
 
 
 class TestVectorSearch:
-    def test_search_empty_store_returns_empty(self, store: GrippyStore) -> None:
-        """Search on empty store returns empty list."""
-        results = store.search_nodes("anything", k=5)
-        assert results == []
-
-    def test_get_all_nodes_empty(self, store: GrippyStore) -> None:
-        """get_all_nodes on empty store returns empty list."""
-        nodes = store.get_all_nodes()
-        assert nodes == []
+    def test_empty_store_queries(self, store: GrippyStore) -> None:
+        """search_nodes and get_all_nodes on an empty store both return empty lists."""
+        assert store.search_nodes("anything", k=5) == []
+        assert store.get_all_nodes() == []
 
 
 # --- Node ID validation ---
@@ -372,7 +478,7 @@ class TestNodeIdValidation:
         stale and must pass validation before reaching table.delete().
         """
         poisoned_id = "FILE:abc' OR 1=1 --"
-        fake_vec = [0.0] * EMBED_DIM
+        fake_vec = list(_VEC_ZERO)
 
         # First call — creates the LanceDB table (no delete path triggered)
         nodes_v1 = [{"id": poisoned_id, "type": "FILE", "label": "old.py", "data": "{}"}]
@@ -391,7 +497,7 @@ class TestNodeIdValidation:
         a new one with the updated embedding is inserted.
         """
         valid_id = "FILE:abcdef012345"
-        fake_vec = [0.1] * EMBED_DIM
+        fake_vec = list(_VEC_LOW)
 
         # First call — creates the table with initial label
         nodes_v1 = [{"id": valid_id, "type": "FILE", "label": "old_label.py", "data": "{}"}]
@@ -405,7 +511,7 @@ class TestNodeIdValidation:
         assert "old_label" in texts_v1[0]
 
         # Second call — same id, different label → stale delete + re-insert
-        new_vec = [0.9] * EMBED_DIM
+        new_vec = list(_VEC_HIGH)
         nodes_v2 = [{"id": valid_id, "type": "FILE", "label": "new_label.py", "data": "{}"}]
         store._upsert_vectors(nodes_v2, [new_vec])
 
@@ -422,7 +528,7 @@ class TestNodeIdValidation:
     def test_upsert_vectors_skips_unchanged_records(self, store: GrippyStore) -> None:
         """Records with same node_id and same text are not re-inserted."""
         valid_id = "FILE:abcdef012345"
-        fake_vec = [0.5] * EMBED_DIM
+        fake_vec = list(_VEC_MID)
 
         nodes = [{"id": valid_id, "type": "FILE", "label": "same.py", "data": "{}"}]
         store._upsert_vectors(nodes, [fake_vec])
@@ -439,36 +545,15 @@ class TestNodeIdValidation:
 class TestPopulatedStoreQueries:
     """Tests for get_all_nodes and search_nodes on a non-empty store."""
 
-    def _insert_node(self, store: GrippyStore) -> None:
-        """Insert a node into both SQLite and LanceDB."""
-        nodes = [
-            {
-                "id": "FILE:abcdef012345",
-                "type": "FILE",
-                "label": "src/app.py",
-                "data": '{"path": "src/app.py"}',
-                "session_id": "pr-1",
-                "status": None,
-                "fingerprint": None,
-                "created_at": "2026-01-01",
-                "updated_at": "2026-01-01",
-            }
-        ]
-        store._upsert_sqlite(nodes, [])
-        vecs = store._compute_embeddings(["FILE src/app.py"])
-        store._upsert_vectors(nodes, vecs)
-
-    def test_get_all_nodes_returns_populated_results(self, store: GrippyStore) -> None:
+    def test_get_all_nodes_returns_populated_results(self, populated: GrippyStore) -> None:
         """get_all_nodes returns records after inserting a node."""
-        self._insert_node(store)
-        nodes = store.get_all_nodes()
+        nodes = populated.get_all_nodes()
         assert len(nodes) == 1
         assert nodes[0]["node_id"] == "FILE:abcdef012345"
 
-    def test_search_nodes_returns_results(self, store: GrippyStore) -> None:
+    def test_search_nodes_returns_results(self, populated: GrippyStore) -> None:
         """search_nodes returns results for a non-empty store."""
-        self._insert_node(store)
-        results = store.search_nodes("app.py", k=5)
+        results = populated.search_nodes("app.py", k=5)
         assert len(results) >= 1
 
 
@@ -479,34 +564,27 @@ class _FakeBatchEmbedder:
     """Embedder that supports both single and batch operations."""
 
     def get_embedding(self, text: str) -> list[float]:
-        import hashlib
-
-        h = hashlib.sha256(text.encode()).digest()
-        return [float(b) / 255.0 for b in h[:EMBED_DIM]]
+        return _fake_vector(text)
 
     def get_embedding_batch(self, texts: list[str]) -> list[list[float]]:
-        return [self.get_embedding(t) for t in texts]
+        return list(map(_fake_vector, texts))
 
 
 class TestBatchEmbedder:
     """Tests for _compute_embeddings batch path."""
 
-    def test_batch_embedder_used_when_available(self, tmp_path: Path) -> None:
-        """BatchEmbedder.get_embedding_batch is called instead of per-item."""
+    def test_compute_embeddings(self, lance_dir: Path) -> None:
+        """Empty input short-circuits; otherwise the batch path returns one vector per text."""
         store = GrippyStore(
-            graph_db_path=tmp_path / "grippy-graph.db",
-            lance_dir=tmp_path / "lance",
+            graph_db_path=":memory:",
+            lance_dir=lance_dir,
             embedder=_FakeBatchEmbedder(),
         )
+        assert store._compute_embeddings([]) == []
         result = store._compute_embeddings(["hello", "world"])
         assert len(result) == 2
         assert len(result[0]) == EMBED_DIM
 
-    def test_compute_embeddings_empty_list(self, store: GrippyStore) -> None:
-        """Empty list returns empty list without calling embedder."""
-        result = store._compute_embeddings([])
-        assert result == []
-
 
 # --- Upsert vectors empty early return ---
 
@@ -547,10 +625,8 @@ class TestSqliteRollback:
         with pytest.raises(ValueError):
             store._upsert_sqlite([good_node], [bad_edge])  # type: ignore[list-item]
 
-        # Verify rollback: no nodes inserted
-        cur = store._conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM nodes")
-        assert cur.fetchone()[0] == 0
+        # Verify rollback: neither nodes nor edges were written
+        assert _row_counts(store._conn) == (0, 0)
 
 
 # --- updated_at migration ---
@@ -559,46 +635,38 @@ class TestSqliteRollback:
 class TestUpdatedAtMigration:
     """Verify _add_updated_at_column adds the column and backfills."""
 
-    def test_adds_updated_at_to_old_schema(self, tmp_path: Path) -> None:
+    def test_adds_updated_at_to_old_schema(self, tmp_path: Path, lance_dir: Path) -> None:
         """DB missing updated_at column gets it added + backfilled from created_at."""
         db_path = tmp_path / "grippy-graph.db"
 
         # Create a DB with the node table but WITHOUT updated_at
-        conn = sqlite3.connect(str(db_path))
-        conn.execute(
+        _seed_db(
+            db_path,
             "CREATE TABLE nodes ("
             "id TEXT PRIMARY KEY, type TEXT NOT NULL, label TEXT NOT NULL, "
             "data TEXT NOT NULL DEFAULT '{}', session_id TEXT, status TEXT, "
-            "fingerprint TEXT, created_at TEXT NOT NULL)"
-        )
-        conn.execute(
+            "fingerprint TEXT, created_at TEXT NOT NULL); "
             "INSERT INTO nodes (id, type, label, created_at) "
-            "VALUES ('n1', 'FILE', 'test.py', '2026-01-15T10:00:00Z')"
-        )
-        # Need edges table too for the store to open
-        conn.execute(
+            "VALUES ('n1', 'FILE', 'test.py', '2026-01-15T10:00:00Z'); "
+            # Need edges table too for the store to open
             "CREATE TABLE edges ("
             "source TEXT NOT NULL, target TEXT NOT NULL, relationship TEXT NOT NULL, "
             "weight REAL DEFAULT 1.0, properties TEXT DEFAULT '{}', "
             "created_at TEXT NOT NULL, "
-            "PRIMARY KEY (source, relationship, target))"
+            "PRIMARY KEY (source, relationship, target));",
         )
-        conn.commit()
-        conn.close()
 
         # Open with GrippyStore — should trigger migration
         store = GrippyStore(
             graph_db_path=db_path,
-            lance_dir=tmp_path / "lance",
+            lance_dir=lance_dir,
             embedder=_FakeEmbedder(),
         )
 
         # Verify column exists and was backfilled
-        cur = store._conn.cursor()
-        cur.execute("PRAGMA table_info(nodes)")
-        columns = {row["name"] for row in cur.fetchall()}
-        assert "updated_at" in columns
+        assert "updated_at" in _schema(store._conn)["nodes"]
 
+        cur = store._conn.cursor()
         cur.execute("SELECT updated_at FROM nodes WHERE id = 'n1'")
         updated_at = cur.fetchone()[0]
         assert updated_at == "2026-01-15T10:00:00Z"
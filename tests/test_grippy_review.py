@@ -13,9 +13,13 @@ import pytest
 
 from grippy.review import (
     MAX_DIFF_CHARS,
+    REVIEW_CACHE_TTL_SECONDS,
     _escape_rule_field,
     _failure_comment,
     _format_rule_findings,
+    _load_cached_review,
+    _review_cache_key,
+    _store_cached_review,
     _with_timeout,
     fetch_pr_diff,
     load_pr_event,
@@ -480,6 +484,27 @@ class TestReviewTimeout:
         result = _with_timeout(lambda: 99, timeout_seconds=10)
         assert result == 99
 
+    def test_sub_second_timeout(self) -> None:
+        """Fractional timeouts fire without rounding up to a whole second."""
+        import time
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutError, match=r"0\.2s"):
+            _with_timeout(lambda: time.sleep(5), timeout_seconds=0.2)
+        assert time.monotonic() - start < 1.0
+
+    def test_off_main_thread_runs_unguarded(self) -> None:
+        """SIGALRM can't be installed off the main thread — fn still runs."""
+        import threading
+
+        results: list[int] = []
+        t = threading.Thread(
+            target=lambda: results.append(_with_timeout(lambda: 7, timeout_seconds=5))
+        )
+        t.start()
+        t.join()
+        assert results == [7]
+
     def test_alarm_restored_after_success(self) -> None:
         """SIGALRM handler is restored after successful execution."""
         import signal
@@ -501,6 +526,174 @@ class TestReviewTimeout:
         assert after is original
 
 
+# --- Review cache ---
+
+
+_CACHE_KEY_INPUTS: dict[str, Any] = {
+    "model_id": "m",
+    "base_url": "http://localhost:1234/v1",
+    "transport": None,
+    "tools_enabled": False,
+    "profile": "general",
+    "mode": "pr_review",
+    "user_message": "+x",
+}
+
+
+class TestReviewCache:
+    """Tests for the opt-in exact-match review cache."""
+
+    def test_key_is_deterministic(self) -> None:
+        """Same inputs produce the same key."""
+        base = dict(_CACHE_KEY_INPUTS)
+        a = _review_cache_key(**base)
+        b = _review_cache_key(**base)
+        assert a == b
+
+    def test_key_varies_with_each_input(self) -> None:
+        """Changing model, endpoint, transport, tools, profile, mode, or prompt changes the key."""
+        base = dict(_CACHE_KEY_INPUTS)
+        keys = {_review_cache_key(**base)}
+        for field, value in [
+            ("model_id", "other"),
+            ("base_url", "https://api.example.com/v1"),
+            ("transport", "openai"),
+            ("tools_enabled", True),
+            ("profile", "security"),
+            ("mode", "security_audit"),
+            ("user_message", "+y"),
+        ]:
+            keys.add(_review_cache_key(**{**base, field: value}))
+        assert len(keys) == 8
+
+    def test_key_varies_with_grippy_version(self) -> None:
+        """Upgrading grippy or its prompt set invalidates earlier entries."""
+        base = dict(_CACHE_KEY_INPUTS)
+        before = _review_cache_key(**base)
+        with patch("grippy.review._review_cache_salt", return_value="9.9.9|other"):
+            after = _review_cache_key(**base)
+        assert before != after
+
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        """A stored review loads back equal to the original."""
+        review = _make_review()
+        _store_cached_review(tmp_path / "cache", "abc", review)
+        loaded = _load_cached_review(tmp_path / "cache", "abc")
+        assert loaded == review
+        assert not list((tmp_path / "cache").glob("*.tmp"))
+
+    def test_missing_entry_returns_none(self, tmp_path: Path) -> None:
+        """No cache file — cache miss."""
+        assert _load_cached_review(tmp_path, "nope") is None
+
+    def test_stale_entry_returns_none(self, tmp_path: Path) -> None:
+        """Entries older than the TTL are ignored."""
+        _store_cached_review(tmp_path, "old", _make_review())
+        stale = os.path.getmtime(tmp_path / "old.json") - REVIEW_CACHE_TTL_SECONDS - 60
+        os.utime(tmp_path / "old.json", (stale, stale))
+        assert _load_cached_review(tmp_path, "old") is None
+
+    def test_corrupt_entry_returns_none(self, tmp_path: Path) -> None:
+        """Invalid JSON is a cache miss, not a crash."""
+        (tmp_path / "bad.json").write_text("{not json")
+        assert _load_cached_review(tmp_path, "bad") is None
+
+    @staticmethod
+    def _run_main_twice(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        *,
+        first_diff: str = "diff --git a/f.py b/f.py\n-old\n+new",
+        second_body: str = "",
+        second_diff: str = "diff --git a/f.py b/f.py\n-old\n+new",
+        second_env: dict[str, str] | None = None,
+    ) -> tuple[MagicMock, MagicMock, MagicMock]:
+        """Run main() twice with the cache on; return (create, run_review, post_review) mocks."""
+        event_path = tmp_path / "event.json"
+
+        def _write_event(body: str) -> None:
+            event = {
+                "pull_request": {
+                    "number": 7,
+                    "title": "feat: add auth",
+                    "user": {"login": "testdev"},
+                    "head": {"ref": "feature/auth"},
+                    "base": {"ref": "main"},
+                    "body": body,
+                },
+                "repository": {"full_name": "org/repo"},
+            }
+            event_path.write_text(json.dumps(event))
+
+        monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+        monkeypatch.setenv("GITHUB_EVENT_PATH", str(event_path))
+        monkeypatch.setenv("GRIPPY_DATA_DIR", str(tmp_path / "data"))
+        monkeypatch.setenv("GRIPPY_TIMEOUT", "0")
+        monkeypatch.setenv("GRIPPY_REVIEW_CACHE", "1")
+        monkeypatch.delenv("GITHUB_WORKSPACE", raising=False)
+
+        from grippy.review import main
+
+        with (
+            patch("grippy.review.fetch_pr_diff") as mock_fetch,
+            patch("grippy.review.create_reviewer") as mock_create,
+            patch("grippy.review.run_review", return_value=_make_review()) as mock_run,
+            patch("grippy.review.post_review") as mock_post,
+        ):
+            _write_event("")
+            mock_fetch.return_value = first_diff
+            main()
+            _write_event(second_body)
+            for name, value in (second_env or {}).items():
+                monkeypatch.setenv(name, value)
+            mock_fetch.return_value = second_diff
+            main()
+        return mock_create, mock_run, mock_post
+
+    def test_main_skips_llm_on_cache_hit(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Second run over the same PR reuses the cached review without building an agent."""
+        mock_create, mock_run, mock_post = self._run_main_twice(tmp_path, monkeypatch)
+        mock_run.assert_called_once()
+        mock_create.assert_called_once()
+        assert mock_post.call_count == 2
+        assert len(list((tmp_path / "data" / "review-cache").glob("*.json"))) == 1
+
+    def test_main_misses_when_only_description_changes(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """An edited PR description is part of the prompt, so it is a new review."""
+        _, mock_run, _ = self._run_main_twice(tmp_path, monkeypatch, second_body="Now with SSO")
+        assert mock_run.call_count == 2
+
+    def test_main_misses_when_only_endpoint_changes(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """The same model id on another server is not the same model."""
+        _, mock_run, _ = self._run_main_twice(
+            tmp_path, monkeypatch, second_env={"GRIPPY_BASE_URL": "http://other:1234/v1"}
+        )
+        assert mock_run.call_count == 2
+
+    def test_main_misses_when_only_rule_findings_change(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Same truncated diff, new rule findings past the cut — the model must see them."""
+        monkeypatch.setenv("GRIPPY_PROFILE", "security")
+        kept = "diff --git a/f.py b/f.py\n--- a/f.py\n+++ b/f.py\n@@ -1 +1 @@\n-old\n+new\n"
+        risky = (
+            "diff --git a/z.py b/z.py\n--- a/z.py\n+++ b/z.py\n@@ -0,0 +1 @@\n"
+            "+f = open(user_path)\n"
+        )
+        # Both runs show the model the same truncated diff; only the rule findings differ
+        with patch("grippy.review.truncate_diff", side_effect=lambda d: d[: len(kept)]):
+            _, mock_run, _ = self._run_main_twice(
+                tmp_path, monkeypatch, first_diff=kept, second_diff=kept + risky
+            )
+        assert mock_run.call_count == 2
+
+
 # --- M3: main() integration tests (mock-based) ---
 
 
@@ -1145,8 +1338,9 @@ class TestMainRuleEngine:
 
         main()
 
-        # Rule engine was called
+        # Rule engine was called with the pre-parsed diff
         mock_run_rules.assert_called_once()
+        assert [f.path for f in mock_run_rules.call_args[1]["files"]] == ["config.py"]
         mock_gate.assert_called_once()
 
         # Mode overridden to security_audit
@@ -1367,6 +1561,27 @@ class TestFormatRuleFindings:
         assert ">" not in text
         assert "&lt;" in text
 
+    def test_repeated_fields_are_sanitized_once(self) -> None:
+        """A file path shared by several findings goes through navi-sanitize once."""
+        _escape_rule_field.cache_clear()
+        results = [
+            RuleResult(
+                rule_id="dangerous-execution-sinks",
+                severity=RuleSeverity.ERROR,
+                message="eval() with non-literal argument",
+                file="src/app.py",
+                line=line,
+            )
+            for line in (3, 7, 11)
+        ]
+        with patch("grippy.review.navi_sanitize.clean", side_effect=lambda t: t) as clean:
+            _format_rule_findings(results)
+        assert sorted(call.args[0] for call in clean.call_args_list) == [
+            "eval() with non-literal argument",
+            "src/app.py",
+        ]
+        _escape_rule_field.cache_clear()
+
 
 # --- main() early validation exits ---
 
@@ -1449,6 +1664,21 @@ class TestMainEarlyExits:
             dev_vars.unlink(missing_ok=True)
             monkeypatch.delenv("DEV_VARS_TEST_MARKER", raising=False)
 
+    def test_dev_vars_parse_cached_until_file_changes(self, tmp_path: Path) -> None:
+        """_load_dev_vars skips comments/blanks and is keyed on mtime + size."""
+        from grippy.review import _load_dev_vars
+
+        path = tmp_path / ".dev.vars"
+        path.write_text("# comment\n\nA = 1\nB=two=2\nnot-a-pair\n")
+        st = path.stat()
+        first = _load_dev_vars(str(path), st.st_mtime_ns, st.st_size)
+        assert first == (("A", "1"), ("B", "two=2"))
+        assert _load_dev_vars(str(path), st.st_mtime_ns, st.st_size) is first
+
+        path.write_text("A=changed\n")
+        st = path.stat()
+        assert _load_dev_vars(str(path), st.st_mtime_ns, st.st_size) == (("A", "changed"),)
+
 
 # --- main() diff fetch error paths ---
 
@@ -1635,6 +1865,30 @@ class TestMainTimeoutError:
         monkeypatch.setenv("GRIPPY_TIMEOUT", "0")
         monkeypatch.delenv("GITHUB_WORKSPACE", raising=False)
 
+    @pytest.mark.parametrize("value", ["inf", "nan", "-5", "soon"])
+    @patch("grippy.review.fetch_pr_diff")
+    def test_invalid_timeout_env_exits_before_review(
+        self,
+        mock_fetch: MagicMock,
+        value: str,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """A non-finite, negative or non-numeric GRIPPY_TIMEOUT is a config error, not a crash."""
+        event_path = self._make_event_file(tmp_path)
+        self._setup_env(monkeypatch, event_path, tmp_path)
+        monkeypatch.setenv("GRIPPY_TIMEOUT", value)
+
+        from grippy.review import main
+
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        assert "::error::GRIPPY_TIMEOUT" in capsys.readouterr().out
+        mock_fetch.assert_not_called()
+
     @patch("grippy.review.post_comment")
     @patch("grippy.review._with_timeout")
     @patch("grippy.review.create_reviewer")
@@ -3,89 +3,89 @@
 
 from __future__ import annotations
 
+import pytest
+
 from grippy.rules.base import RuleSeverity
 from grippy.rules.ci_script_risk import CiScriptRiskRule
-from grippy.rules.config import ProfileConfig
-from grippy.rules.context import RuleContext, parse_diff
+from tests._rule_helpers import ctx, make_diff
 
 
-def _ctx(diff: str) -> RuleContext:
-    return RuleContext(
-        diff=diff,
-        files=parse_diff(diff),
-        config=ProfileConfig(name="security", fail_on=RuleSeverity.ERROR),
-    )
+@pytest.fixture(scope="module")
+def ci_rule() -> CiScriptRiskRule:
+    return CiScriptRiskRule()
 
 
-def _make_diff(path: str, added_line: str) -> str:
-    return (
-        f"diff --git a/{path} b/{path}\n"
-        f"--- a/{path}\n"
-        f"+++ b/{path}\n"
-        "@@ -1,1 +1,2 @@\n"
-        " existing\n"
-        f"+{added_line}\n"
-    )
+_WORKFLOW = ".github/workflows/ci.yml"
 
 
 class TestCiScriptRisk:
-    def test_curl_pipe_bash(self) -> None:
-        diff = _make_diff(
-            ".github/workflows/ci.yml",
-            "      run: curl -sSL https://example.com/install.sh | bash",
-        )
-        results = CiScriptRiskRule().run(_ctx(diff))
+    @pytest.mark.parametrize(
+        ("path", "added_line", "severity", "substr"),
+        [
+            pytest.param(
+                _WORKFLOW,
+                "      run: curl -sSL https://example.com/install.sh | bash",
+                RuleSeverity.CRITICAL,
+                "pipe",
+                id="curl_pipe_bash",
+            ),
+            pytest.param(
+                _WORKFLOW,
+                "      run: wget -O- https://example.com/install.sh | sh",
+                RuleSeverity.CRITICAL,
+                None,
+                id="wget_pipe_sh",
+            ),
+            pytest.param(
+                _WORKFLOW,
+                "      run: sudo apt-get install -y package",
+                RuleSeverity.WARN,
+                "sudo",
+                id="sudo_in_workflow",
+            ),
+            pytest.param(
+                "scripts/deploy.sh", "chmod +x deploy.sh", RuleSeverity.WARN, "chmod", id="chmod_x"
+            ),
+            pytest.param(
+                "Dockerfile",
+                "RUN curl https://example.com/install.sh | bash",
+                RuleSeverity.CRITICAL,
+                None,
+                id="dockerfile",
+            ),
+            pytest.param("Makefile", "\tsudo make install", None, "sudo", id="makefile"),
+            pytest.param(
+                "scripts/setup.sh",
+                "curl https://get.example.com | bash",
+                RuleSeverity.CRITICAL,
+                None,
+                id="shell_script",
+            ),
+            pytest.param(
+                "deploy.bash", "sudo systemctl restart app", None, "sudo", id="bash_extension"
+            ),
+        ],
+    )
+    def test_flags_risky_line(
+        self,
+        ci_rule: CiScriptRiskRule,
+        path: str,
+        added_line: str,
+        severity: RuleSeverity | None,
+        substr: str | None,
+    ) -> None:
+        results = ci_rule.run(ctx(make_diff(path, added_line)))
         assert any(
-            r.severity == RuleSeverity.CRITICAL and "pipe" in r.message.lower() for r in results
-        )
-
-    def test_wget_pipe_sh(self) -> None:
-        diff = _make_diff(
-            ".github/workflows/ci.yml",
-            "      run: wget -O- https://example.com/install.sh | sh",
+            (severity is None or r.severity == severity) and (substr is None or substr in r.message)
+            for r in results
         )
-        results = CiScriptRiskRule().run(_ctx(diff))
-        assert any(r.severity == RuleSeverity.CRITICAL for r in results)
-
-    def test_sudo_in_workflow(self) -> None:
-        diff = _make_diff(
-            ".github/workflows/ci.yml",
-            "      run: sudo apt-get install -y package",
-        )
-        results = CiScriptRiskRule().run(_ctx(diff))
-        assert any(r.severity == RuleSeverity.WARN and "sudo" in r.message for r in results)
-
-    def test_chmod_x(self) -> None:
-        diff = _make_diff("scripts/deploy.sh", "chmod +x deploy.sh")
-        results = CiScriptRiskRule().run(_ctx(diff))
-        assert any(r.severity == RuleSeverity.WARN and "chmod" in r.message for r in results)
-
-    def test_dockerfile(self) -> None:
-        diff = _make_diff("Dockerfile", "RUN curl https://example.com/install.sh | bash")
-        results = CiScriptRiskRule().run(_ctx(diff))
-        assert any(r.severity == RuleSeverity.CRITICAL for r in results)
-
-    def test_makefile(self) -> None:
-        diff = _make_diff("Makefile", "\tsudo make install")
-        results = CiScriptRiskRule().run(_ctx(diff))
-        assert any("sudo" in r.message for r in results)
-
-    def test_shell_script(self) -> None:
-        diff = _make_diff("scripts/setup.sh", "curl https://get.example.com | bash")
-        results = CiScriptRiskRule().run(_ctx(diff))
-        assert any(r.severity == RuleSeverity.CRITICAL for r in results)
-
-    def test_bash_extension(self) -> None:
-        diff = _make_diff("deploy.bash", "sudo systemctl restart app")
-        results = CiScriptRiskRule().run(_ctx(diff))
-        assert any("sudo" in r.message for r in results)
 
-    def test_non_ci_file_ignored(self) -> None:
-        diff = _make_diff("app.py", "# curl https://example.com | bash")
-        results = CiScriptRiskRule().run(_ctx(diff))
+    def test_non_ci_file_ignored(self, ci_rule: CiScriptRiskRule) -> None:
+        diff = make_diff("app.py", "# curl https://example.com | bash")
+        results = ci_rule.run(ctx(diff))
         assert results == []
 
-    def test_context_line_not_flagged(self) -> None:
+    def test_context_line_not_flagged(self, ci_rule: CiScriptRiskRule) -> None:
         diff = (
             "diff --git a/.github/workflows/ci.yml b/.github/workflows/ci.yml\n"
             "--- a/.github/workflows/ci.yml\n"
@@ -95,5 +95,5 @@ class TestCiScriptRisk:
             "+# new comment\n"
             " other: true\n"
         )
-        results = CiScriptRiskRule().run(_ctx(diff))
+        results = ci_rule.run(ctx(diff))
         assert not any(r.severity == RuleSeverity.CRITICAL for r in results)
@@ -3,110 +3,132 @@
 
 from __future__ import annotations
 
+import pytest
+
 from grippy.rules.base import RuleSeverity
-from grippy.rules.config import ProfileConfig
-from grippy.rules.context import RuleContext, parse_diff
 from grippy.rules.llm_output_sinks import SANITIZERS, LlmOutputSinksRule
+from tests._rule_helpers import ctx, make_diff
 
 
-def _ctx(diff: str) -> RuleContext:
-    return RuleContext(
-        diff=diff,
-        files=parse_diff(diff),
-        config=ProfileConfig(name="security", fail_on=RuleSeverity.ERROR),
-    )
-
-
-def _make_diff(path: str, *added_lines: str) -> str:
-    lines = [
-        f"diff --git a/{path} b/{path}\n",
-        f"--- a/{path}\n",
-        f"+++ b/{path}\n",
-        f"@@ -1,1 +1,{len(added_lines) + 1} @@\n",
-        " existing\n",
-    ]
-    for line in added_lines:
-        lines.append(f"+{line}\n")
-    return "".join(lines)
+@pytest.fixture(scope="module")
+def llm_rule() -> LlmOutputSinksRule:
+    return LlmOutputSinksRule()
 
 
 class TestLlmOutputSinks:
-    def test_direct_pipe_to_comment(self) -> None:
-        diff = _make_diff(
+    @pytest.mark.parametrize(
+        ("path", "added_lines", "flagged"),
+        [
+            pytest.param(
+                "bot.py",
+                ("    result = agent.run(prompt)", "    pr.create_issue_comment(result.content)"),
+                True,
+                id="direct_pipe_to_comment",
+            ),
+            pytest.param(
+                "bot.py",
+                (
+                    "    result = agent.run(prompt)",
+                    "    safe = sanitize(result.content)",
+                    "    pr.create_issue_comment(safe)",
+                ),
+                False,
+                id="sanitized_output_not_flagged",
+            ),
+            pytest.param(
+                "bot.py",
+                (
+                    "    result = agent.run(prompt)",
+                    "    safe = html.escape(result.content)",
+                    "    pr.create_issue_comment(safe)",
+                ),
+                False,
+                id="html_escape_suppresses",
+            ),
+            pytest.param(
+                "handler.py",
+                ("    completion = model.generate(prompt)", "    post(completion)"),
+                True,
+                id="completion_to_post",
+            ),
+            pytest.param(
+                "handler.py",
+                ("    text = response.choices[0].text", "    comment.body = text"),
+                True,
+                id="choices_to_body",
+            ),
+            pytest.param(
+                "handler.py",
+                ("    text = 'hello world'", "    pr.create_issue_comment(text)"),
+                False,
+                id="no_model_output_not_flagged",
+            ),
+            pytest.param(
+                "handler.js",
+                (
+                    "    const result = agent.run(prompt);",
+                    "    pr.create_issue_comment(result.content);",
+                ),
+                False,
+                id="non_python_file_ignored",
+            ),
+        ],
+    )
+    def test_flags_unsanitized_output(
+        self,
+        llm_rule: LlmOutputSinksRule,
+        path: str,
+        added_lines: tuple[str, ...],
+        flagged: bool,
+    ) -> None:
+        results = llm_rule.run(ctx(make_diff(path, *added_lines)))
+        if flagged:
+            assert any(r.rule_id == "llm-output-unsanitized" for r in results)
+        else:
+            assert results == []
+
+    def test_severity_is_error(self, llm_rule: LlmOutputSinksRule) -> None:
+        diff = make_diff(
             "bot.py",
             "    result = agent.run(prompt)",
             "    pr.create_issue_comment(result.content)",
         )
-        results = LlmOutputSinksRule().run(_ctx(diff))
-        assert any(r.rule_id == "llm-output-unsanitized" for r in results)
-
-    def test_sanitized_output_not_flagged(self) -> None:
-        diff = _make_diff(
-            "bot.py",
-            "    result = agent.run(prompt)",
-            "    safe = sanitize(result.content)",
-            "    pr.create_issue_comment(safe)",
-        )
-        results = LlmOutputSinksRule().run(_ctx(diff))
-        assert not any(r.rule_id == "llm-output-unsanitized" for r in results)
-
-    def test_html_escape_suppresses(self) -> None:
-        diff = _make_diff(
-            "bot.py",
-            "    result = agent.run(prompt)",
-            "    safe = html.escape(result.content)",
-            "    pr.create_issue_comment(safe)",
-        )
-        results = LlmOutputSinksRule().run(_ctx(diff))
-        assert not any(r.rule_id == "llm-output-unsanitized" for r in results)
-
-    def test_completion_to_post(self) -> None:
-        diff = _make_diff(
-            "handler.py",
-            "    completion = model.generate(prompt)",
-            "    post(completion)",
-        )
-        results = LlmOutputSinksRule().run(_ctx(diff))
-        assert any(r.rule_id == "llm-output-unsanitized" for r in results)
+        results = llm_rule.run(ctx(diff))
+        assert all(r.severity == RuleSeverity.ERROR for r in results)
 
-    def test_choices_to_body(self) -> None:
-        diff = _make_diff(
-            "handler.py",
-            "    text = response.choices[0].text",
-            "    comment.body = text",
-        )
-        results = LlmOutputSinksRule().run(_ctx(diff))
-        assert any(r.rule_id == "llm-output-unsanitized" for r in results)
+    def test_sanitizers_frozenset(self) -> None:
+        assert isinstance(SANITIZERS, frozenset)
+        assert "sanitize" in SANITIZERS
+        assert "html.escape" in SANITIZERS
+        assert "_sanitize_comment_text" in SANITIZERS
 
-    def test_no_model_output_not_flagged(self) -> None:
-        diff = _make_diff(
-            "handler.py",
-            "    text = 'hello world'",
-            "    pr.create_issue_comment(text)",
-        )
-        results = LlmOutputSinksRule().run(_ctx(diff))
-        assert results == []
+    def test_sanitizer_pattern_is_deterministic(self) -> None:
+        from grippy.rules.llm_output_sinks import _SANITIZER_LIST, _SANITIZER_RE
 
-    def test_non_python_file_ignored(self) -> None:
-        diff = _make_diff(
-            "handler.js",
-            "    const result = agent.run(prompt);",
-            "    pr.create_issue_comment(result.content);",
-        )
-        results = LlmOutputSinksRule().run(_ctx(diff))
-        assert results == []
+        assert frozenset(_SANITIZER_LIST) == SANITIZERS
+        lengths = [len(s) for s in _SANITIZER_LIST]
+        assert lengths == sorted(lengths, reverse=True)
+        assert _SANITIZER_RE.pattern.startswith("_sanitize_comment_text|")
 
-    def test_severity_is_error(self) -> None:
-        diff = _make_diff(
+    def test_sanitizer_after_sink_does_not_suppress(self, llm_rule: LlmOutputSinksRule) -> None:
+        diff = make_diff(
             "bot.py",
             "    result = agent.run(prompt)",
-            "    pr.create_issue_comment(result.content)",
+            "    pr.create_issue_comment(result)",
+            "    safe = sanitize(result)",
         )
-        results = LlmOutputSinksRule().run(_ctx(diff))
-        assert all(r.severity == RuleSeverity.ERROR for r in results)
+        results = llm_rule.run(ctx(diff))
+        assert [r.line for r in results] == [3]
 
-    def test_sanitizers_frozenset(self) -> None:
-        assert isinstance(SANITIZERS, frozenset)
-        assert "sanitize" in SANITIZERS
-        assert "html.escape" in SANITIZERS
-        assert "_sanitize_comment_text" in SANITIZERS
+    def test_chain_closes_at_first_sink(self, llm_rule: LlmOutputSinksRule) -> None:
+        """A later model output starts a fresh chain after the first sink fires."""
+        diff = make_diff(
+            "bot.py",
+            "    a = agent.run(p1)",
+            "    post(a)",
+            "    b = agent.run(p2)",
+            "    clean_b = escape(b)",
+            "    post(clean_b)",
+        )
+        results = llm_rule.run(ctx(diff))
+        assert [r.line for r in results] == [3]
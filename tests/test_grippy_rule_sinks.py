@@ -3,118 +3,105 @@
 
 from __future__ import annotations
 
+import pytest
+
 from grippy.rules.base import RuleSeverity
-from grippy.rules.config import ProfileConfig
-from grippy.rules.context import RuleContext, parse_diff
 from grippy.rules.dangerous_sinks import DangerousSinksRule
+from tests._rule_helpers import ctx, make_diff
 
 
-def _ctx(diff: str) -> RuleContext:
-    return RuleContext(
-        diff=diff,
-        files=parse_diff(diff),
-        config=ProfileConfig(name="security", fail_on=RuleSeverity.ERROR),
-    )
-
-
-def _make_diff(path: str, added_line: str) -> str:
-    return (
-        f"diff --git a/{path} b/{path}\n"
-        f"--- a/{path}\n"
-        f"+++ b/{path}\n"
-        "@@ -1,1 +1,2 @@\n"
-        " existing\n"
-        f"+{added_line}\n"
-    )
+@pytest.fixture(scope="module")
+def sinks_rule() -> DangerousSinksRule:
+    return DangerousSinksRule()
 
 
 class TestDangerousSinks:
-    def test_python_eval(self) -> None:
-        diff = _make_diff("app.py", "result = eval(user_input)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_eval(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "result = eval(user_input)")
+        results = sinks_rule.run(ctx(diff))
         assert any("eval()" in r.message for r in results)
 
-    def test_python_exec(self) -> None:
-        diff = _make_diff("app.py", "exec(code)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_exec(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "exec(code)")
+        results = sinks_rule.run(ctx(diff))
         assert any("exec()" in r.message for r in results)
 
-    def test_python_os_system(self) -> None:
-        diff = _make_diff("app.py", "os.system(cmd)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_os_system(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "os.system(cmd)")
+        results = sinks_rule.run(ctx(diff))
         assert any("os.system()" in r.message for r in results)
 
-    def test_python_os_popen(self) -> None:
-        diff = _make_diff("app.py", "os.popen(cmd)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_os_popen(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "os.popen(cmd)")
+        results = sinks_rule.run(ctx(diff))
         assert any("os.popen()" in r.message for r in results)
 
-    def test_python_subprocess_shell_true(self) -> None:
-        diff = _make_diff("app.py", "subprocess.run(cmd, shell=True)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_subprocess_shell_true(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "subprocess.run(cmd, shell=True)")
+        results = sinks_rule.run(ctx(diff))
         assert any("subprocess" in r.message and "shell=True" in r.message for r in results)
 
-    def test_python_pickle_loads(self) -> None:
-        diff = _make_diff("app.py", "data = pickle.loads(raw)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_pickle_loads(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "data = pickle.loads(raw)")
+        results = sinks_rule.run(ctx(diff))
         assert any("pickle" in r.message for r in results)
 
-    def test_python_marshal_loads(self) -> None:
-        diff = _make_diff("app.py", "data = marshal.loads(raw)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_marshal_loads(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "data = marshal.loads(raw)")
+        results = sinks_rule.run(ctx(diff))
         assert any("marshal" in r.message for r in results)
 
-    def test_python_yaml_load_unsafe(self) -> None:
-        diff = _make_diff("app.py", "data = yaml.load(content)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_yaml_load_unsafe(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "data = yaml.load(content)")
+        results = sinks_rule.run(ctx(diff))
         assert any("yaml.load()" in r.message for r in results)
 
-    def test_python_yaml_load_with_safe_loader(self) -> None:
-        diff = _make_diff("app.py", "data = yaml.load(content, Loader=SafeLoader)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_yaml_load_with_safe_loader(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "data = yaml.load(content, Loader=SafeLoader)")
+        results = sinks_rule.run(ctx(diff))
         assert not any("yaml.load()" in r.message for r in results)
 
-    def test_python_yaml_safe_load(self) -> None:
-        diff = _make_diff("app.py", "data = yaml.safe_load(content)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_python_yaml_safe_load(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "data = yaml.safe_load(content)")
+        results = sinks_rule.run(ctx(diff))
         assert not any("yaml" in r.message.lower() for r in results)
 
-    def test_js_eval(self) -> None:
-        diff = _make_diff("app.js", "const result = eval(userInput);")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_js_eval(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.js", "const result = eval(userInput);")
+        results = sinks_rule.run(ctx(diff))
         assert any("eval()" in r.message for r in results)
 
-    def test_js_new_function(self) -> None:
-        diff = _make_diff("app.ts", "const fn = new Function(code);")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_js_new_function(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.ts", "const fn = new Function(code);")
+        results = sinks_rule.run(ctx(diff))
         assert any("new Function()" in r.message for r in results)
 
-    def test_js_require_child_process(self) -> None:
-        diff = _make_diff("app.js", "const cp = require('child_process');")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_js_require_child_process(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.js", "const cp = require('child_process');")
+        results = sinks_rule.run(ctx(diff))
         assert any("child_process" in r.message for r in results)
 
-    def test_js_exec_sync(self) -> None:
-        diff = _make_diff("build.ts", "execSync(command);")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_js_exec_sync(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("build.ts", "execSync(command);")
+        results = sinks_rule.run(ctx(diff))
         assert any("execSync()" in r.message for r in results)
 
-    def test_jsx_file(self) -> None:
-        diff = _make_diff("component.jsx", "const x = eval(input);")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_jsx_file(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("component.jsx", "const x = eval(input);")
+        results = sinks_rule.run(ctx(diff))
         assert any("eval()" in r.message for r in results)
 
-    def test_tsx_file(self) -> None:
-        diff = _make_diff("component.tsx", "const x = eval(input);")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_tsx_file(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("component.tsx", "const x = eval(input);")
+        results = sinks_rule.run(ctx(diff))
         assert any("eval()" in r.message for r in results)
 
-    def test_non_code_file_ignored(self) -> None:
-        diff = _make_diff("README.md", "Use eval() to execute code")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_non_code_file_ignored(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("README.md", "Use eval() to execute code")
+        results = sinks_rule.run(ctx(diff))
         assert results == []
 
-    def test_context_line_not_flagged(self) -> None:
+    def test_context_line_not_flagged(self, sinks_rule: DangerousSinksRule) -> None:
         diff = (
             "diff --git a/app.py b/app.py\n"
             "--- a/app.py\n"
@@ -124,10 +111,32 @@ class TestDangerousSinks:
             "+# comment\n"
             " other = True\n"
         )
-        results = DangerousSinksRule().run(_ctx(diff))
+        results = sinks_rule.run(ctx(diff))
         assert not any("eval()" in r.message for r in results)
 
-    def test_severity_is_error(self) -> None:
-        diff = _make_diff("app.py", "result = eval(x)")
-        results = DangerousSinksRule().run(_ctx(diff))
+    def test_severity_is_error(self, sinks_rule: DangerousSinksRule) -> None:
+        diff = make_diff("app.py", "result = eval(x)")
+        results = sinks_rule.run(ctx(diff))
         assert all(r.severity == RuleSeverity.ERROR for r in results)
+
+    def test_list_order_names_the_sink(self, sinks_rule: DangerousSinksRule) -> None:
+        """With several sinks on one line, the first in the table is reported."""
+        diff = make_diff("app.py", "exec(eval(payload))")
+        results = sinks_rule.run(ctx(diff))
+        assert [r.message for r in results] == ["Dangerous execution sink: eval()"]
+
+    def test_indented_and_mid_line_sinks(self, sinks_rule: DangerousSinksRule) -> None:
+        """Sinks are found whether they open an indented line or sit mid-line."""
+        for line in ("        eval(payload)", "x = 1; os.system(cmd)"):
+            results = sinks_rule.run(ctx(make_diff("app.py", line)))
+            assert len(results) == 1, line
+            assert results[0].evidence == line.strip()
+
+    @pytest.mark.parametrize("path", ["app.py", "app.js"])
+    def test_repeated_path_reports_each_line_once(
+        self, sinks_rule: DangerousSinksRule, path: str
+    ) -> None:
+        """A path listed twice (concatenated per-commit diffs) is scanned once."""
+        diff = make_diff(path, "eval(payload)") + make_diff(path, "x = 1")
+        results = sinks_rule.run(ctx(diff))
+        assert [(r.file, r.line) for r in results] == [(path, 2)]
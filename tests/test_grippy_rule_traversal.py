@@ -3,88 +3,99 @@
 
 from __future__ import annotations
 
+import pytest
+
 from grippy.rules.base import RuleSeverity
-from grippy.rules.config import ProfileConfig
-from grippy.rules.context import RuleContext, parse_diff
 from grippy.rules.path_traversal import PathTraversalRule
+from tests._rule_helpers import ctx, make_diff
 
 
-def _ctx(diff: str) -> RuleContext:
-    return RuleContext(
-        diff=diff,
-        files=parse_diff(diff),
-        config=ProfileConfig(name="security", fail_on=RuleSeverity.ERROR),
-    )
-
-
-def _make_diff(path: str, added_line: str) -> str:
-    return (
-        f"diff --git a/{path} b/{path}\n"
-        f"--- a/{path}\n"
-        f"+++ b/{path}\n"
-        "@@ -1,1 +1,2 @@\n"
-        " existing\n"
-        f"+{added_line}\n"
-    )
+@pytest.fixture(scope="module")
+def traversal_rule() -> PathTraversalRule:
+    return PathTraversalRule()
 
 
 class TestPathTraversal:
-    def test_open_with_user_input(self) -> None:
-        diff = _make_diff("app.py", "f = open(user_path)")
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_open_with_user_input_warns(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.py", "f = open(user_path)")
+        results = traversal_rule.run(ctx(diff))
         assert any("user-controlled" in r.message for r in results)
+        assert all(r.severity == RuleSeverity.WARN for r in results)
 
-    def test_open_with_request(self) -> None:
-        diff = _make_diff("app.py", "f = open(request.form['file'])")
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_open_with_request(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.py", "f = open(request.form['file'])")
+        results = traversal_rule.run(ctx(diff))
         assert len(results) >= 1
 
-    def test_path_join_with_input(self) -> None:
-        diff = _make_diff("app.py", "p = os.path.join(base, user_input)")
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_path_join_with_input(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.py", "p = os.path.join(base, user_input)")
+        results = traversal_rule.run(ctx(diff))
         assert any(r.rule_id == "path-traversal-risk" for r in results)
 
-    def test_path_join_with_upload(self) -> None:
-        diff = _make_diff("views.py", "p = path.join(upload_dir, upload_filename)")
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_path_join_with_upload(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("views.py", "p = path.join(upload_dir, upload_filename)")
+        results = traversal_rule.run(ctx(diff))
         assert len(results) >= 1
 
-    def test_string_literal_not_flagged(self) -> None:
-        diff = _make_diff("app.py", 'f = open("config.json")')
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_string_literal_not_flagged(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.py", 'f = open("config.json")')
+        results = traversal_rule.run(ctx(diff))
         assert results == []
 
-    def test_traversal_unix(self) -> None:
-        diff = _make_diff("app.py", 'p = os.path.join(base, "../../../etc/passwd")')
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_traversal_unix(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.py", 'p = os.path.join(base, "../../../etc/passwd")')
+        results = traversal_rule.run(ctx(diff))
         assert any("traversal" in r.message.lower() for r in results)
 
-    def test_traversal_windows(self) -> None:
-        diff = _make_diff("app.py", 'p = os.path.join(base, "..\\\\..\\\\secret")')
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_traversal_windows(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.py", 'p = os.path.join(base, "..\\\\..\\\\secret")')
+        results = traversal_rule.run(ctx(diff))
         assert any("traversal" in r.message.lower() for r in results)
 
-    def test_non_code_file_ignored(self) -> None:
-        diff = _make_diff("README.md", "open(user_path)")
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_non_code_file_ignored(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("README.md", "open(user_path)")
+        results = traversal_rule.run(ctx(diff))
         assert results == []
 
-    def test_js_file_supported(self) -> None:
-        diff = _make_diff("app.js", "const f = path.join(base, user_input)")
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_js_file_supported(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.js", "const f = path.join(base, user_input)")
+        results = traversal_rule.run(ctx(diff))
         assert len(results) >= 1
 
-    def test_ts_file_supported(self) -> None:
-        diff = _make_diff("app.ts", "const f = path.join(base, user_input)")
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_ts_file_supported(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.ts", "const f = path.join(base, user_input)")
+        results = traversal_rule.run(ctx(diff))
         assert len(results) >= 1
 
-    def test_severity_is_warn(self) -> None:
-        diff = _make_diff("app.py", "f = open(user_path)")
-        results = PathTraversalRule().run(_ctx(diff))
-        assert all(r.severity == RuleSeverity.WARN for r in results)
-
-    def test_no_taint_indicator_not_flagged(self) -> None:
-        diff = _make_diff("app.py", "f = open(config_path)")
-        results = PathTraversalRule().run(_ctx(diff))
+    def test_no_taint_indicator_not_flagged(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.py", "f = open(config_path)")
+        results = traversal_rule.run(ctx(diff))
         assert results == []
+
+    def test_taint_name_must_be_whole_alphabetic_run(self) -> None:
+        from grippy.rules.path_traversal import _has_taint_indicator
+
+        assert _has_taint_indicator("open(user_id)")
+        assert _has_taint_indicator("open(Request2.path)")
+        assert _has_taint_indicator("open(x + QUERY)")
+        assert not _has_taint_indicator("open(username)")
+        assert not _has_taint_indicator("open(inputs)")
+        # Only the arguments portion counts
+        assert not _has_taint_indicator("user = open(config_path)")
+
+    def test_string_literal_after_tainted_call_still_skips_line(
+        self, traversal_rule: PathTraversalRule
+    ) -> None:
+        """A literal-only call anywhere on the line suppresses it, as before the gate."""
+        diff = make_diff("app.py", 'f = open(user_path, Path("static"))')
+        assert traversal_rule.run(ctx(diff)) == []
+
+    def test_line_without_file_op_ignored(self, traversal_rule: PathTraversalRule) -> None:
+        diff = make_diff("app.py", "data = request.args['../x']")
+        assert traversal_rule.run(ctx(diff)) == []
+
+    def test_repeated_path_reports_each_line_once(self, traversal_rule: PathTraversalRule) -> None:
+        """A path listed twice (concatenated per-commit diffs) is scanned once."""
+        diff = make_diff("app.py", "f = open(user_path)") + make_diff("app.py", "x = 1")
+        results = traversal_rule.run(ctx(diff))
+        assert [(r.file, r.line) for r in results] == [("app.py", 2)]
@@ -3,178 +3,163 @@
 
 from __future__ import annotations
 
+import pytest
+
 from grippy.rules.base import RuleSeverity
-from grippy.rules.config import ProfileConfig
-from grippy.rules.context import RuleContext, parse_diff
 from grippy.rules.workflow_permissions import WorkflowPermissionsRule
+from tests._rule_helpers import ctx, make_diff
 
+_WORKFLOW_PATH = ".github/workflows/ci.yml"
 
-def _ctx(diff: str) -> RuleContext:
-    return RuleContext(
-        diff=diff,
-        files=parse_diff(diff),
-        config=ProfileConfig(name="security", fail_on=RuleSeverity.ERROR),
-    )
+
+@pytest.fixture(scope="module")
+def workflow_rule() -> WorkflowPermissionsRule:
+    return WorkflowPermissionsRule()
 
 
 class TestWorkflowPermissions:
-    def test_write_permission_on_added_line(self) -> None:
-        diff = (
-            "diff --git a/.github/workflows/deploy.yml b/.github/workflows/deploy.yml\n"
-            "--- a/.github/workflows/deploy.yml\n"
-            "+++ b/.github/workflows/deploy.yml\n"
-            "@@ -1,3 +1,5 @@\n"
-            " name: deploy\n"
-            "+permissions:\n"
-            "+  contents: write\n"
-            " on:\n"
-            "   push:\n"
-        )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert any(
-            r.severity == RuleSeverity.ERROR and "write" in r.message.lower() for r in results
-        )
+    @pytest.mark.parametrize(
+        ("added_lines", "severity", "fragment"),
+        [
+            (("permissions:", "  contents: write"), RuleSeverity.ERROR, "write/admin"),
+            (("permissions:", "  packages: admin"), RuleSeverity.ERROR, "write/admin"),
+            (("permissions:", "  contents: read"), None, "write/admin"),
+            (("permissions: write-all",), RuleSeverity.ERROR, "write/admin"),
+            (("permissions: read-all",), None, "write/admin"),
+            (("  pull_request_target:",), RuleSeverity.ERROR, "pull_request_target"),
+            (("      - uses: actions/checkout@v4",), RuleSeverity.WARN, "Unpinned"),
+            (
+                ("      - uses: actions/checkout@b4ffde65f46336ab88eb53be808477a3936bae11",),
+                None,
+                "Unpinned",
+            ),
+            (("      - uses: ./my-action",), None, "Unpinned"),
+        ],
+        ids=[
+            "block-write",
+            "block-admin",
+            "block-read",
+            "scalar-write-all",
+            "scalar-read-all",
+            "pull-request-target",
+            "unpinned-tag",
+            "sha-pinned",
+            "local-action",
+        ],
+    )
+    def test_added_workflow_lines(
+        self,
+        workflow_rule: WorkflowPermissionsRule,
+        added_lines: tuple[str, ...],
+        severity: RuleSeverity | None,
+        fragment: str,
+    ) -> None:
+        """*severity* None means no finding may mention *fragment*."""
+        results = workflow_rule.run(ctx(make_diff(_WORKFLOW_PATH, *added_lines)))
+        if severity is None:
+            assert not any(fragment in r.message for r in results)
+        else:
+            assert any(r.severity == severity and fragment in r.message for r in results)
 
-    def test_admin_permission(self) -> None:
+    def test_non_workflow_file_ignored(self, workflow_rule: WorkflowPermissionsRule) -> None:
         diff = (
-            "diff --git a/.github/workflows/ci.yml b/.github/workflows/ci.yml\n"
-            "--- a/.github/workflows/ci.yml\n"
-            "+++ b/.github/workflows/ci.yml\n"
-            "@@ -1,3 +1,5 @@\n"
-            " name: ci\n"
-            "+permissions:\n"
-            "+  packages: admin\n"
-            " on:\n"
-            "   push:\n"
+            "diff --git a/config.yml b/config.yml\n"
+            "--- a/config.yml\n"
+            "+++ b/config.yml\n"
+            "@@ -1,1 +1,2 @@\n"
+            " key: value\n"
+            "+permissions: write\n"
         )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert any(r.severity == RuleSeverity.ERROR for r in results)
+        results = workflow_rule.run(ctx(diff))
+        assert results == []
 
-    def test_read_permission_not_flagged(self) -> None:
+    def test_line_with_several_triggers_reports_each(
+        self, workflow_rule: WorkflowPermissionsRule
+    ) -> None:
         diff = (
             "diff --git a/.github/workflows/ci.yml b/.github/workflows/ci.yml\n"
             "--- a/.github/workflows/ci.yml\n"
             "+++ b/.github/workflows/ci.yml\n"
-            "@@ -1,3 +1,5 @@\n"
-            " name: ci\n"
-            "+permissions:\n"
-            "+  contents: read\n"
-            " on:\n"
-            "   push:\n"
-        )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert not any(
-            "write" in r.message.lower() or "admin" in r.message.lower() for r in results
+            "@@ -1,1 +1,2 @@\n"
+            " steps:\n"
+            "+  - uses: org/pull_request_target@v1\n"
         )
+        results = workflow_rule.run(ctx(diff))
+        messages = sorted(r.message.split(" ")[0] for r in results)
+        assert messages == ["Unpinned", "pull_request_target"]
 
-    def test_pull_request_target(self) -> None:
-        diff = (
-            "diff --git a/.github/workflows/pr.yml b/.github/workflows/pr.yml\n"
-            "--- a/.github/workflows/pr.yml\n"
-            "+++ b/.github/workflows/pr.yml\n"
-            "@@ -1,3 +1,4 @@\n"
-            " name: pr\n"
-            " on:\n"
-            "+  pull_request_target:\n"
-            "   push:\n"
-        )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert any("pull_request_target" in r.message for r in results)
+    def test_near_added_mask_marks_neighbourhood(self) -> None:
+        from grippy.rules.context import DiffLine
+        from grippy.rules.workflow_permissions import _near_added_mask
 
-    def test_unpinned_action(self) -> None:
-        diff = (
-            "diff --git a/.github/workflows/ci.yml b/.github/workflows/ci.yml\n"
-            "--- a/.github/workflows/ci.yml\n"
-            "+++ b/.github/workflows/ci.yml\n"
-            "@@ -5,3 +5,4 @@\n"
-            " jobs:\n"
-            "   build:\n"
-            "     steps:\n"
-            "+      - uses: actions/checkout@v4\n"
-        )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert any(r.severity == RuleSeverity.WARN and "Unpinned" in r.message for r in results)
+        types = ["context"] * 4 + ["add"] + ["context"] * 4
+        dlines = [DiffLine(type=t, content="", old_lineno=1, new_lineno=1) for t in types]
+        near = _near_added_mask(dlines)
+        assert [i for i, flag in enumerate(near) if flag] == [2, 3, 4, 5, 6]
 
-    def test_sha_pinned_action_not_flagged(self) -> None:
-        diff = (
-            "diff --git a/.github/workflows/ci.yml b/.github/workflows/ci.yml\n"
-            "--- a/.github/workflows/ci.yml\n"
-            "+++ b/.github/workflows/ci.yml\n"
-            "@@ -5,3 +5,4 @@\n"
-            " jobs:\n"
-            "   build:\n"
-            "     steps:\n"
-            "+      - uses: actions/checkout@b4ffde65f46336ab88eb53be808477a3936bae11\n"
-        )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert not any("Unpinned" in r.message for r in results)
+    def test_uses_ref_and_sha_pin_helpers(self) -> None:
+        from grippy.rules.workflow_permissions import _is_sha_pinned, _uses_ref
 
-    def test_local_action_not_flagged(self) -> None:
-        diff = (
-            "diff --git a/.github/workflows/ci.yml b/.github/workflows/ci.yml\n"
-            "--- a/.github/workflows/ci.yml\n"
-            "+++ b/.github/workflows/ci.yml\n"
-            "@@ -5,3 +5,4 @@\n"
-            " jobs:\n"
-            "   build:\n"
-            "     steps:\n"
-            "+      - uses: ./my-action\n"
-        )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert not any("Unpinned" in r.message for r in results)
+        sha = "0123456789abcdef0123456789abcdef01234567"
+        assert _uses_ref("    - uses: actions/checkout@v4 ") == "actions/checkout@v4"
+        assert _uses_ref("-uses: x") == "x"
+        assert _uses_ref("  uses:") is None
+        assert _uses_ref("  run: uses: x") is None
+        assert _is_sha_pinned(f"actions/checkout@{sha}")
+        assert _is_sha_pinned(f"actions/checkout@{sha} # v4")
+        assert not _is_sha_pinned(f"actions/checkout@{sha}a")
+        assert not _is_sha_pinned(f"actions/checkout@{sha.upper()}")
+        assert not _is_sha_pinned("actions/checkout@v4")
 
-    def test_scalar_permissions_write_all(self) -> None:
-        """Scalar 'permissions: write-all' on same line is detected."""
-        diff = (
-            "diff --git a/.github/workflows/deploy.yml b/.github/workflows/deploy.yml\n"
-            "--- a/.github/workflows/deploy.yml\n"
-            "+++ b/.github/workflows/deploy.yml\n"
-            "@@ -1,3 +1,4 @@\n"
-            " name: deploy\n"
-            "+permissions: write-all\n"
-            " on:\n"
-            "   push:\n"
-        )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert any(
-            r.severity == RuleSeverity.ERROR and "write" in r.message.lower() for r in results
-        )
+    def test_write_admin_matches_whole_words_only(self) -> None:
+        from grippy.rules.workflow_permissions import _has_write_admin
 
-    def test_scalar_permissions_read_not_flagged(self) -> None:
-        """Scalar 'permissions: read-all' is not flagged."""
+        assert _has_write_admin("  contents: write")
+        assert _has_write_admin("permissions: write-all")
+        assert not _has_write_admin("  contents: read  # rewrite later")
+        assert not _has_write_admin("  contents: WRITE")
+
+    def test_matching_lines_maps_offsets_to_line_indices(self) -> None:
+        from grippy.rules.workflow_permissions import _PR_TARGET_RE, _matching_lines
+
+        contents = [
+            "on:",
+            "  pull_request_target:",
+            "",
+            "x pull_request_target pull_request_target",
+        ]
+        assert _matching_lines(_PR_TARGET_RE, "\n".join(contents), contents) == {1, 3}
+        assert _matching_lines(_PR_TARGET_RE, "on: push", ["on: push"]) == set()
+
+    def test_spaced_permissions_key_passes_hunk_gate(
+        self, workflow_rule: WorkflowPermissionsRule
+    ) -> None:
         diff = (
             "diff --git a/.github/workflows/ci.yml b/.github/workflows/ci.yml\n"
             "--- a/.github/workflows/ci.yml\n"
             "+++ b/.github/workflows/ci.yml\n"
-            "@@ -1,3 +1,4 @@\n"
+            "@@ -1,1 +1,2 @@\n"
             " name: ci\n"
-            "+permissions: read-all\n"
-            " on:\n"
-            "   push:\n"
-        )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert not any(
-            "write" in r.message.lower() or "admin" in r.message.lower() for r in results
+            "+permissions : write-all\n"
         )
+        results = workflow_rule.run(ctx(diff))
+        assert [r.line for r in results] == [2]
 
-    def test_non_workflow_file_ignored(self) -> None:
-        diff = (
-            "diff --git a/config.yml b/config.yml\n"
-            "--- a/config.yml\n"
-            "+++ b/config.yml\n"
-            "@@ -1,1 +1,2 @@\n"
-            " key: value\n"
-            "+permissions: write\n"
+    def test_identical_hunks_in_several_workflows_report_each_file(
+        self, workflow_rule: WorkflowPermissionsRule
+    ) -> None:
+        diff = "".join(
+            f"diff --git a/.github/workflows/{name}.yml b/.github/workflows/{name}.yml\n"
+            f"--- a/.github/workflows/{name}.yml\n"
+            f"+++ b/.github/workflows/{name}.yml\n"
+            "@@ -1,1 +1,1 @@\n"
+            "-      - uses: actions/checkout@v3\n"
+            "+      - uses: actions/checkout@v4\n"
+            for name in ("ci", "release")
         )
-        rule = WorkflowPermissionsRule()
-        results = rule.run(_ctx(diff))
-        assert results == []
+        results = workflow_rule.run(ctx(diff))
+        assert [r.file for r in results] == [
+            ".github/workflows/ci.yml",
+            ".github/workflows/release.yml",
+        ]
+        assert results[0].message == results[1].message
@@ -11,9 +11,7 @@ from grippy.rules.config import PROFILES, load_profile
 
 class TestProfileConfig:
     def test_all_profiles_exist(self) -> None:
-        assert "general" in PROFILES
-        assert "security" in PROFILES
-        assert "strict-security" in PROFILES
+        assert {"general", "security", "strict-security"} <= PROFILES.keys()
 
     def test_general_profile(self) -> None:
         p = PROFILES["general"]
@@ -31,27 +29,35 @@ class TestProfileConfig:
         assert p.fail_on == RuleSeverity.WARN
 
 
-class TestLoadProfile:
-    def test_cli_override_highest_priority(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("GRIPPY_PROFILE", "general")
-        p = load_profile(cli_profile="security")
-        assert p.name == "security"
-
-    def test_env_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("GRIPPY_PROFILE", "strict-security")
-        p = load_profile()
-        assert p.name == "strict-security"
-
-    def test_default_is_general(self, monkeypatch: pytest.MonkeyPatch) -> None:
+def _set_profile_env(monkeypatch: pytest.MonkeyPatch, env: str | None) -> None:
+    if env is None:
         monkeypatch.delenv("GRIPPY_PROFILE", raising=False)
-        p = load_profile()
-        assert p.name == "general"
+    else:
+        monkeypatch.setenv("GRIPPY_PROFILE", env)
 
-    def test_invalid_profile_raises(self) -> None:
-        with pytest.raises(ValueError, match="Unknown profile"):
-            load_profile(cli_profile="nonexistent")
 
-    def test_invalid_env_profile_raises(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("GRIPPY_PROFILE", "badname")
+class TestLoadProfile:
+    @pytest.mark.parametrize(
+        ("env", "cli", "expected"),
+        [
+            ("general", "security", "security"),
+            ("strict-security", None, "strict-security"),
+            (None, None, "general"),
+        ],
+        ids=["cli-over-env", "env", "default"],
+    )
+    def test_resolves_profile(
+        self, monkeypatch: pytest.MonkeyPatch, env: str | None, cli: str | None, expected: str
+    ) -> None:
+        _set_profile_env(monkeypatch, env)
+        assert load_profile(cli_profile=cli).name == expected
+
+    @pytest.mark.parametrize(
+        ("env", "cli"), [(None, "nonexistent"), ("badname", None)], ids=["cli", "env"]
+    )
+    def test_invalid_profile_raises(
+        self, monkeypatch: pytest.MonkeyPatch, env: str | None, cli: str | None
+    ) -> None:
+        _set_profile_env(monkeypatch, env)
         with pytest.raises(ValueError, match="Unknown profile"):
-            load_profile()
+            load_profile(cli_profile=cli)
@@ -237,3 +237,105 @@ class TestRuleContext:
         files = [ChangedFile(path="src/foo.py", hunks=[hunk])]
         ctx = RuleContext(diff="", files=files, config=config)
         assert ctx.added_lines_for("*.js") == []
+
+    def test_added_lines_for_exact_path(self, config: ProfileConfig) -> None:
+        hunk = DiffHunk(
+            old_start=1,
+            old_count=1,
+            new_start=1,
+            new_count=2,
+            lines=[
+                DiffLine(type="remove", content="old", old_lineno=1, new_lineno=None),
+                DiffLine(type="add", content="new", old_lineno=None, new_lineno=1),
+            ],
+        )
+        files = [
+            ChangedFile(path="src/foo.py", hunks=[hunk]),
+            ChangedFile(path="src/bar.py", hunks=[hunk]),
+        ]
+        ctx = RuleContext(diff="", files=files, config=config)
+        assert ctx.added_lines_for("src/bar.py") == [("src/bar.py", 1, "new")]
+        assert ctx.added_lines_for("src/missing.py") == []
+        assert [p for p, _, _ in ctx.added_lines_for("src/*.py")] == ["src/foo.py", "src/bar.py"]
+
+    def test_added_lines_in_returns_shared_index(self, config: ProfileConfig) -> None:
+        hunk = DiffHunk(
+            old_start=1,
+            old_count=0,
+            new_start=1,
+            new_count=2,
+            lines=[
+                DiffLine(type="add", content="a", old_lineno=None, new_lineno=1),
+                DiffLine(type="context", content="b", old_lineno=1, new_lineno=2),
+            ],
+        )
+        ctx = RuleContext(diff="", files=[ChangedFile(path="x.py", hunks=[hunk])], config=config)
+        assert ctx.added_lines_in("x.py") == [(1, "a")]
+        assert ctx.added_lines_in("x.py") is ctx.added_lines_in("x.py")
+        assert ctx.added_lines_in("nope.py") == []
+
+    def test_added_lines_for_glob_compiled_once(self, config: ProfileConfig) -> None:
+        from grippy.rules.context import _compile_glob
+
+        hunk = DiffHunk(
+            old_start=1,
+            old_count=0,
+            new_start=1,
+            new_count=1,
+            lines=[DiffLine(type="add", content="x", old_lineno=None, new_lineno=1)],
+        )
+        files = [ChangedFile(path=p, hunks=[hunk]) for p in ("a.md", "b.md", "c.py")]
+        ctx = RuleContext(diff="", files=files, config=config)
+        _compile_glob.cache_clear()
+        assert [p for p, _, _ in ctx.added_lines_for("*.md")] == ["a.md", "b.md"]
+        ctx.added_lines_for("*.md")
+        assert _compile_glob.cache_info().misses == 1
+
+    def test_files_by_ext_buckets(self, config: ProfileConfig) -> None:
+        files = [ChangedFile(path=p, hunks=[]) for p in ("a.py", "b.js", "c.py", "Makefile")]
+        ctx = RuleContext(diff="", files=files, config=config)
+        assert [f.path for f in ctx.files_by_ext[".py"]] == ["a.py", "c.py"]
+        assert [f.path for f in ctx.files_by_ext[""]] == ["Makefile"]
+
+    def test_files_with_ext_keeps_diff_order(self, config: ProfileConfig) -> None:
+        files = [ChangedFile(path=p, hunks=[]) for p in ("a.py", "b.js", "c.py", "d.md")]
+        ctx = RuleContext(diff="", files=files, config=config)
+        assert [f.path for f in ctx.files_with_ext(frozenset({".py", ".js"}))] == [
+            "a.py",
+            "b.js",
+            "c.py",
+        ]
+        assert [f.path for f in ctx.files_with_ext(frozenset({".md", ".rs"}))] == ["d.md"]
+        assert ctx.files_with_ext(frozenset({".rs"})) == []
+
+    def test_added_text_in_joins_added_lines(self, config: ProfileConfig) -> None:
+        hunk = DiffHunk(
+            old_start=1,
+            old_count=1,
+            new_start=1,
+            new_count=3,
+            lines=[
+                DiffLine(type="add", content="one", old_lineno=None, new_lineno=1),
+                DiffLine(type="context", content="skip", old_lineno=1, new_lineno=2),
+                DiffLine(type="add", content="two", old_lineno=None, new_lineno=3),
+            ],
+        )
+        ctx = RuleContext(diff="", files=[ChangedFile(path="x.py", hunks=[hunk])], config=config)
+        assert ctx.added_text_in("x.py") == "one\ntwo"
+        assert ctx.added_text_in("x.py") is ctx.added_text_in("x.py")
+        assert ctx.added_text_in("missing.py") == ""
+
+
+class TestDiffModelSlots:
+    def test_diff_models_have_no_instance_dict(self) -> None:
+        line = DiffLine(type="add", content="x", old_lineno=None, new_lineno=1)
+        hunk = DiffHunk(old_start=1, old_count=0, new_start=1, new_count=1, lines=[line])
+        changed = ChangedFile(path="a.py", hunks=[hunk])
+        for obj in (line, hunk, changed):
+            assert not hasattr(obj, "__dict__")
+
+    def test_changed_file_caches_extension(self) -> None:
+        assert ChangedFile(path="src/app.py", hunks=[]).ext == ".py"
+        assert ChangedFile(path="Makefile", hunks=[]).ext == ""
+        assert ChangedFile(path="pkg.d/README", hunks=[]).ext == ".d/README"
+        assert ChangedFile(path="a.py", hunks=[]) == ChangedFile(path="a.py", hunks=[])
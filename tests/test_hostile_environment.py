@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import inspect
 import json
+import re
 from pathlib import Path
 from typing import Any
 from unittest.mock import patch
@@ -153,6 +154,20 @@ def _minimal_diff() -> str:
     )
 
 
+def _off_diff_summary(file: str) -> str:
+    """Summary comment carrying one off-diff finding on *file*."""
+    return format_summary_comment(
+        score=50,
+        verdict="FAIL",
+        finding_count=1,
+        new_count=1,
+        resolved_count=0,
+        off_diff_findings=[_make_finding(file=file)],
+        head_sha="abc1234def",  # pragma: allowlist secret
+        pr_number=1,
+    )
+
+
 # ============================================================
 # Class 1: Unicode Input Attacks
 # ============================================================
@@ -375,17 +390,7 @@ class TestOutputSanitizationGaps:
         assert "evil.com" not in result
 
     def test_off_diff_file_path_sanitized(self) -> None:
-        finding = _make_finding(file="src/\u202eevil.py")
-        summary = format_summary_comment(
-            score=50,
-            verdict="FAIL",
-            finding_count=1,
-            new_count=1,
-            resolved_count=0,
-            off_diff_findings=[finding],
-            head_sha="abc1234def",  # pragma: allowlist secret
-            pr_number=1,
-        )
+        summary = _off_diff_summary("src/\u202eevil.py")
         # Desired: bidi chars in file path should be stripped
         # (as _sanitize_path does for inline comments)
         assert "\u202e" not in summary
@@ -401,43 +406,51 @@ class TestOutputSanitizationGaps:
 # ============================================================
 
 
+@pytest.fixture(scope="module")
+def hostile_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """One read-only repo shared by the codebase-tool tests.
+
+    Holds a symlink to a secret outside the repo and a ReDoS bait file.
+    """
+    base = tmp_path_factory.mktemp("hostile")
+    secret = base / "secret.txt"
+    secret.write_text("TOP SECRET DATA")
+    repo = base / "repo"
+    repo.mkdir()
+    (repo / "legit.py").write_text("print('hello')\n")
+    (repo / "redos.py").write_text("a" * 10_000 + "!\n")
+    (repo / "escape").symlink_to(secret)
+    return repo
+
+
 class TestCodebaseToolExploitation:
     """Novel attacks beyond basic path traversal."""
 
-    def test_symlink_escape_blocked(self, tmp_path: Path) -> None:
-        secret = tmp_path / "secret.txt"
-        secret.write_text("TOP SECRET DATA")
-        repo = tmp_path / "repo"
-        repo.mkdir()
-        (repo / "legit.py").write_text("print('hello')\n")
-        link = repo / "escape"
-        link.symlink_to(secret)
-        read_file = _make_read_file(repo)
+    def test_symlink_escape_blocked(self, hostile_repo: Path) -> None:
+        read_file = _make_read_file(hostile_repo)
         result = read_file("escape")
         assert "TOP SECRET" not in result
         assert "not allowed" in result.lower() or "not found" in result.lower()
 
-    def test_redos_regex_times_out(self, tmp_path: Path) -> None:
+    def test_redos_regex_times_out(self, hostile_repo: Path) -> None:
         """Catastrophic backtracking regex handled by subprocess timeout."""
-        (tmp_path / "test.py").write_text("a" * 10_000 + "!\n")
-        grep_code = _make_grep_code(tmp_path)
+        grep_code = _make_grep_code(hostile_repo)
         # Even if grep's engine handles this, the timeout is the defense
         result = grep_code("(a+)+$", glob="*.py")  # intentional ReDoS payload
         assert isinstance(result, str)
 
-    def test_null_bytes_in_path_handled(self, tmp_path: Path) -> None:
-        (tmp_path / "legit.py").write_text("print('ok')\n")
-        read_file = _make_read_file(tmp_path)
+    def test_null_bytes_in_path_handled(self, hostile_repo: Path) -> None:
+        read_file = _make_read_file(hostile_repo)
         result = read_file("legit\x00.py")
         assert "error" in result.lower() or "not found" in result.lower()
 
-    def test_glob_has_timeout_protection(self, tmp_path: Path) -> None:
+    def test_glob_has_timeout_protection(self) -> None:
         """list_files has no timeout protection for Path.glob()."""
         source = inspect.getsource(_make_list_files)
         # Desired: glob operations should have timeout protection
-        assert "timeout" in source.lower() or "signal" in source.lower()
+        assert re.search("timeout|signal", source, re.IGNORECASE)
 
-    def test_large_file_size_limit(self, tmp_path: Path) -> None:
+    def test_large_file_size_limit(self) -> None:
         """read_file checks file size before reading."""
         source = inspect.getsource(_make_read_file)
         # Desired: check file size (stat) before reading
@@ -581,35 +594,18 @@ class TestSchemaValidationAttacks:
         assert len(missing) > 0
         assert "flagged files" in missing[0]
 
-    def test_finding_file_newlines_stripped(self) -> None:
-        finding = _make_finding(file="src/app.py\n## Injected Heading")
-        summary = format_summary_comment(
-            score=50,
-            verdict="FAIL",
-            finding_count=1,
-            new_count=1,
-            resolved_count=0,
-            off_diff_findings=[finding],
-            head_sha="abc1234def",  # pragma: allowlist secret
-            pr_number=1,
-        )
-        # Desired: newlines in file path should not reach comment
-        assert "## Injected Heading" not in summary
-
-    def test_finding_file_backticks_stripped(self) -> None:
-        finding = _make_finding(file="src/`escape`me.py")
-        summary = format_summary_comment(
-            score=50,
-            verdict="FAIL",
-            finding_count=1,
-            new_count=1,
-            resolved_count=0,
-            off_diff_findings=[finding],
-            head_sha="abc1234def",  # pragma: allowlist secret
-            pr_number=1,
-        )
-        # Desired: backticks should be escaped before markdown embedding
-        assert "`src/`escape`me.py:" not in summary
+    @pytest.mark.parametrize(
+        ("hostile_file", "forbidden"),
+        [
+            # Newlines in the file path must not reach the comment as markdown
+            ("src/app.py\n## Injected Heading", "## Injected Heading"),
+            # Backticks must be escaped before markdown embedding
+            ("src/`escape`me.py", "`src/`escape`me.py:"),
+        ],
+        ids=["newlines", "backticks"],
+    )
+    def test_finding_file_markdown_stripped(self, hostile_file: str, forbidden: str) -> None:
+        assert forbidden not in _off_diff_summary(hostile_file)
 
 
 # ============================================================
@@ -639,7 +635,7 @@ class TestSessionHistoryPoisoning:
         """Source documents why history injection is disabled."""
         source = inspect.getsource(create_reviewer)
         # Must contain security rationale for the disabled history
-        assert "sanitize" in source.lower() or "poisoning" in source.lower()
+        assert re.search("sanitize|poisoning", source, re.IGNORECASE)
 
 
 # ============================================================